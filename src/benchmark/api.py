@@ -0,0 +1,90 @@
+from argparse import ArgumentParser
+from dataclasses import replace
+from datetime import date, timedelta
+from logging import getLogger
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config.config import FigureCache, Graph, Jobs as JobsCfg, SeriesCache, SQLite as Cfg
+from internal.adapter.db.cache.exchange_rate import ExchangeRateCache
+from internal.adapter.db.sqlite.coverage import CoverageStorage
+from internal.adapter.db.sqlite.currency_code import CurrencyCodeStorage
+from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
+from internal.adapter.db.sqlite.parameter import parameterStorage
+from internal.controller.api import ApiHandler
+from internal.controller.graph import GraphHandler
+from internal.domain.usecase.currency_code import CurrencyCodeUsecase
+from internal.domain.usecase.exchange_rate import ExchangeRateUsecase
+from pkg.jobs.jobs import Jobs
+from pkg.sqlite.sqlite import SQLite
+from benchmark.decode import synthetic_exchange_rates
+
+
+def dash_payload(codes: list[str], start: date, end: date, n_clicks: int) -> dict:
+    return {
+        'output': '..my-output.children...my-job.data...my-interval.disabled..',
+        'outputs': [
+            {'id': 'my-output', 'property': 'children'},
+            {'id': 'my-job', 'property': 'data'},
+            {'id': 'my-interval', 'property': 'disabled'},
+        ],
+        'inputs': [
+            {'id': 'my-date-picker-range', 'property': 'start_date', 'value': start.isoformat()},
+            {'id': 'my-date-picker-range', 'property': 'end_date', 'value': end.isoformat()},
+            {'id': 'my-checklist', 'property': 'value', 'value': codes},
+            {'id': 'my-radio-1', 'property': 'value', 'value': 'ABS'},
+            {'id': 'my-radio-2', 'property': 'value', 'value': 'DB'},
+            {'id': 'my-date-picker-std', 'property': 'date', 'value': start.isoformat()},
+            {'id': 'my-button', 'property': 'n_clicks', 'value': n_clicks},
+        ],
+        'changedPropIds': ['my-button.n_clicks'],
+        'state': [],
+    }
+
+
+def measure(name: str, request, number: int) -> float:
+    request(0)
+    start = perf_counter()
+    for i in range(number):
+        request(i + 1)
+    elapsed = (perf_counter() - start) / number
+    print(f'{name}: {elapsed * 1000:.2f} ms/request, {1 / elapsed:.0f} req/s')
+    return elapsed
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Сравнение REST API /api/rates и Dash колбэка /graph/ на одном запросе')
+    parser.add_argument('--rows', type=int, default=3650)
+    parser.add_argument('--number', type=int, default=50)
+    args = parser.parse_args()
+    codes = ['EUR', 'USD']
+    with TemporaryDirectory() as directory:
+        sqlite = SQLite(Cfg(path=path.join(directory, 'api.db'), timeout=5, tries=1, synchronous='NORMAL', cache_size=-65536, busy_timeout=5000))
+        sqlite.setup_database()
+        sqlite.set_std_date('01.01.2000')
+        logger = getLogger(__name__)
+        storage = ExchangeRateStorage(sqlite, logger)
+        for code in codes:
+            storage.bulk_upsert([replace(exchangeRate, Code=code) for exchangeRate in synthetic_exchange_rates(args.rows)])
+        exchangeRateUsecase = ExchangeRateUsecase(ExchangeRateCache(storage, SeriesCache(enabled=True, max_size=64 * 2 ** 20), logger), parameterStorage(sqlite, logger), CoverageStorage(sqlite, logger), None, 500)
+        currencyCodeUsecase = CurrencyCodeUsecase(CurrencyCodeStorage(sqlite, logger), None, 500)
+        jobs = Jobs(JobsCfg(concurrency=1, history=1), logger)
+        app = FastAPI()
+        ApiHandler(exchangeRateUsecase, currencyCodeUsecase).register(app)
+        GraphHandler(exchangeRateUsecase, jobs, Graph(max_points=1500, webgl_threshold=5000), FigureCache(enabled=False, max_size=0), JobsCfg(poll_interval=1000)).register(app)
+        client = TestClient(app)
+        start = date(1992, 7, 1)
+        end = start + timedelta(days=args.rows)
+        params = {'codes': ','.join(codes), 'from': start.isoformat(), 'to': end.isoformat(), 'limit': 10000}
+        etag = client.get('/api/rates', params=params).headers['ETag']
+        dash_time = measure('Dash /graph/ callback', lambda i: client.post('/graph/_dash-update-component', json=dash_payload(codes, start, end, i + 1)).raise_for_status(), args.number)
+        api_time = measure('REST /api/rates', lambda i: client.get('/api/rates', params=params).raise_for_status(), args.number)
+        measure('REST /api/rates, If-None-Match', lambda i: client.get('/api/rates', params=params, headers={'If-None-Match': etag}), args.number)
+        jobs.shutdown()
+    print(f'REST is x{dash_time / api_time:.1f} faster than the Dash callback for {len(codes)} x {args.rows} rows')
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
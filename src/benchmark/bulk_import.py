@@ -0,0 +1,71 @@
+from argparse import ArgumentParser
+from dataclasses import replace
+from datetime import date
+from logging import getLogger
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import pandas as pd
+from config.config import SQLite as Cfg
+from internal.adapter.db.sqlite.coverage import CoverageStorage
+from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
+from internal.adapter.db.sqlite.parameter import parameterStorage
+from internal.adapter.file.exchange_rate import ExchangeRateFile
+from internal.domain.usecase.exchange_rate import ExchangeRateUsecase
+from pkg.sqlite.sqlite import SQLite
+from benchmark.decode import synthetic_exchange_rates
+
+
+def new_storage(directory: str, name: str) -> tuple[SQLite, ExchangeRateStorage]:
+    sqlite = SQLite(Cfg(path=path.join(directory, name), timeout=5, tries=1, synchronous='NORMAL', cache_size=-65536, busy_timeout=5000))
+    sqlite.setup_database()
+    sqlite.set_std_date('01.01.2000')
+    return sqlite, ExchangeRateStorage(sqlite, getLogger(__name__))
+
+
+def report(name: str, rows: int, elapsed: float) -> None:
+    print(f'{name}: {elapsed:.2f} s, {rows / elapsed:.0f} rows/s')
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Сравнение загрузки истории курсов пачками bulk_upsert и импорта из файла')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--codes', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+    codes = [f'A{chr(65 + i // 26)}{chr(65 + i % 26)}' for i in range(args.codes)]
+    exchangeRate_list = [replace(exchangeRate, Code=code) for code in codes for exchangeRate in synthetic_exchange_rates(args.rows)]
+    rows = len(exchangeRate_list)
+    with TemporaryDirectory() as directory:
+        frame = pd.DataFrame({
+            'code': [exchangeRate.Code for exchangeRate in exchangeRate_list],
+            'date': [exchangeRate.Date.isoformat() for exchangeRate in exchangeRate_list],
+            'count': [exchangeRate.Count for exchangeRate in exchangeRate_list],
+            'rate': [float(exchangeRate.Rate) for exchangeRate in exchangeRate_list],
+            'change': [float(exchangeRate.Change) for exchangeRate in exchangeRate_list],
+        })
+        frame.to_csv(path.join(directory, 'rates.csv'), index=False)
+        frame.to_parquet(path.join(directory, 'rates.parquet'), index=False)
+        _, storage = new_storage(directory, 'upsert.db')
+        start = perf_counter()
+        for i in range(0, rows, args.batch_size):
+            storage.bulk_upsert(exchangeRate_list[i:i + args.batch_size])
+        upsert_time = perf_counter() - start
+        report(f'bulk_upsert by {args.batch_size}', rows, upsert_time)
+        best_time = upsert_time
+        for name, rebuildThreshold in (('csv', rows + 1), ('csv', 0), ('parquet', rows + 1), ('parquet', 0)):
+            sqlite, storage = new_storage(directory, f'{name}_{rebuildThreshold}.db')
+            usecase = ExchangeRateUsecase(storage, parameterStorage(sqlite, getLogger(__name__)), CoverageStorage(sqlite, getLogger(__name__)), None, args.batch_size)
+            start = perf_counter()
+            count = usecase.import_data(ExchangeRateFile(getLogger(__name__)).iter_series(path.join(directory, f'rates.{name}'), None, args.chunk_size), rebuildThreshold)
+            elapsed = perf_counter() - start
+            if count != rows or sum(len(series) for series in storage.get_series(codes, date.min, date.max)) != rows:
+                raise Exception('число загруженных строк не совпадает')
+            report(f"import {name}, {'rebuild indexes' if rebuildThreshold == 0 else 'keep indexes'}", rows, elapsed)
+            best_time = min(best_time, elapsed)
+    print(f'{rows} rows: import is up to x{upsert_time / best_time:.1f} faster than bulk_upsert batches')
+
+
+if __name__ == '__main__':
+    main()
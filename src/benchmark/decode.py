@@ -0,0 +1,78 @@
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from decimal import Decimal
+from logging import getLogger
+from os import path
+from sqlite3 import connect, Connection
+from tempfile import TemporaryDirectory
+from timeit import repeat
+from config.config import SQLite as Cfg
+from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
+from internal.domain.entity.exchange_rate import ExchangeRate
+from pkg.sqlite.sqlite import SQLite
+
+
+def synthetic_exchange_rates(rows: int) -> list[ExchangeRate]:
+    start = date(1992, 7, 1)
+    return [
+        ExchangeRate(
+            Date=start + timedelta(days=i),
+            Count=1,
+            Rate=Decimal(f'{90 + (i % 5000) / 1000:.4f}'),
+            Change=Decimal(f'-0.{i % 10000:04d}'),
+            Code='USD'
+        )
+        for i in range(rows)
+    ]
+
+
+def legacy_table(connection: Connection, exchangeRate_list: list[ExchangeRate]) -> None:
+    connection.execute("CREATE TABLE legacy_exchange_rates (id INTEGER PRIMARY KEY, date TEXT, count INTEGER, rate TEXT, change TEXT, code TEXT);")
+    connection.executemany(
+        "INSERT INTO legacy_exchange_rates (date, count, rate, change, code) VALUES (?, ?, ?, ?, ?);",
+        [(str(e.Date), e.Count, str(e.Rate), str(e.Change), e.Code) for e in exchangeRate_list]
+    )
+    connection.commit()
+
+
+def legacy_decode(connection: Connection) -> list[ExchangeRate]:
+    exchangeRate_list: list[ExchangeRate] = []
+    for raw_exchangeRate in connection.execute("SELECT id, date, count, rate, change, code FROM legacy_exchange_rates ORDER BY date;").fetchall():
+        d = str(raw_exchangeRate[1]).split('-')
+        exchangeRate_list.append(ExchangeRate(
+            Id=int(raw_exchangeRate[0]),
+            Date=date(int(d[0]), int(d[1]), int(d[2])),
+            Count=int(raw_exchangeRate[2]),
+            Rate=Decimal(raw_exchangeRate[3]),
+            Change=Decimal(raw_exchangeRate[4]),
+            Code=str(raw_exchangeRate[5]),
+        ))
+    return exchangeRate_list
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Сравнение стоимости декодирования строк курсов валют из SQLite')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    exchangeRate_list = synthetic_exchange_rates(args.rows)
+    with TemporaryDirectory() as directory:
+        cfg = Cfg(path=path.join(directory, 'decode.db'), timeout=5, tries=1, synchronous='NORMAL', cache_size=-65536, busy_timeout=5000)
+        sqlite = SQLite(cfg)
+        sqlite.setup_database()
+        storage = ExchangeRateStorage(sqlite, getLogger(__name__))
+        storage.bulk_upsert(exchangeRate_list)
+        connection = connect(path.join(directory, 'legacy.db'))
+        legacy_table(connection, exchangeRate_list)
+        expected = [(e.Date, e.Count, e.Rate, e.Change, e.Code) for e in legacy_decode(connection)]
+        actual = [(e.Date, e.Count, e.Rate, e.Change, e.Code) for e in storage.get_many(ExchangeRate(Code='USD'))]
+        if expected != actual:
+            raise Exception('результаты декодирования не совпадают')
+        legacy_time = min(repeat(lambda: legacy_decode(connection), number=1, repeat=args.repeat))
+        factory_time = min(repeat(lambda: storage.get_many(ExchangeRate(Code='USD')), number=1, repeat=args.repeat))
+        connection.close()
+    print(f'{args.rows} rows: legacy TEXT {legacy_time * 10 ** 9 / args.rows:.0f} ns/row, row factory {factory_time * 10 ** 9 / args.rows:.0f} ns/row, x{legacy_time / factory_time:.1f}')
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
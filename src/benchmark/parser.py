@@ -0,0 +1,106 @@
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from decimal import Decimal
+from timeit import repeat
+from bs4 import BeautifulSoup, Tag
+from internal.domain.entity.currency_code import CurrencyCode
+from internal.domain.entity.exchange_rate import ExchangeRate
+from internal.webapi.parser import CurrencyCodeParser, ExchangeRateParser
+
+
+def bs4_exchange_rates(code: str, content: bytes) -> list[ExchangeRate]:
+    bs = BeautifulSoup(content, "lxml")
+    table = bs.find('table', attrs={'class': 'karramba'})
+    rows: list[Tag] = table.find('tbody').find_all('tr')
+    exchangeRateList: list[ExchangeRate] = []
+    for row in rows:
+        cols: list[Tag] = row.find_all('td')
+        d = cols[0].get_text().split('.')
+        exchangeRateList.append(ExchangeRate(
+            Date=date(int(d[2]), int(d[1]), int(d[0])),
+            Count=int(cols[1].get_text()),
+            Rate=Decimal(cols[2].get_text().replace(',', '.')),
+            Change=Decimal(cols[3].get_text().replace(',', '.').replace('+', '')),
+            Code=code,
+        ))
+    return exchangeRateList
+
+
+def bs4_currency_codes(content: bytes) -> list[CurrencyCode]:
+    bs = BeautifulSoup(content, "lxml")
+    table = bs.find('table', attrs={'class': 'table table-bordered downloads tablesorter'})
+    rows: list[Tag] = table.find('tbody').find_all('tr')
+    currencyCodeList: list[CurrencyCode] = []
+    for row in rows:
+        cols: list[Tag] = row.find_all('td')
+        number = cols[3].get_text()
+        currencyCode = CurrencyCode(
+            Country=cols[0].get_text(),
+            Currency=cols[1].get_text(),
+            Code=cols[2].get_text(),
+            Number=int(number) if number else -1
+        )
+        if currencyCode.Code:
+            currencyCodeList.append(currencyCode)
+    return currencyCodeList
+
+
+def synthetic_exchange_rates_page(days: int) -> bytes:
+    rows: list[str] = []
+    d = date(2020, 1, 1)
+    for i in range(days):
+        rate = f'{90 + (i % 500) / 100:.4f}'.replace('.', ',')
+        rows.append(f'<tr><td class="date">{d.day:02d}.{d.month:02d}.{d.year}</td><td>1</td><td>{rate}</td><td>+0,{i % 10000:04d}</td></tr>')
+        d += timedelta(days=1)
+    filler = '<div class="news"><a href="#">Новость</a><p>' + 'Курсы валют ЦБ РФ. ' * 50 + '</p></div>'
+    return (
+        '<html><head><meta charset="utf-8"><title>Архив курсов</title></head><body>'
+        + filler * 40
+        + '<table class="karramba"><thead><tr><th>Дата</th><th>Кол-во</th><th>Курс</th><th>Изменение</th></tr></thead><tbody>'
+        + ''.join(rows)
+        + '</tbody></table>'
+        + filler * 20
+        + '</body></html>'
+    ).encode('utf-8')
+
+
+def synthetic_currency_codes_page(count: int) -> bytes:
+    rows = [f'<tr><td>\n  Страна {i} </td><td>Валюта {i}\n</td><td>{"" if i % 17 == 0 else f"C{i:02d}"}</td><td>{"" if i % 13 == 0 else i}</td></tr>' for i in range(count)]
+    return (
+        '<html><head><meta charset="utf-8"></head><body>'
+        + '<table class="table table-bordered downloads tablesorter"><thead><tr><th>Страна</th><th>Валюта</th><th>Код</th><th>Номер</th></tr></thead><tbody>'
+        + ''.join(rows)
+        + '</tbody></table></body></html>'
+    ).encode('utf-8')
+
+
+def measure(name: str, baseline, candidate, number: int) -> None:
+    expected = baseline()
+    actual = candidate()
+    if expected != actual:
+        raise Exception(f'{name}: результаты парсеров не совпадают')
+    bs4_time = min(repeat(baseline, number=number, repeat=5)) / number
+    lxml_time = min(repeat(candidate, number=number, repeat=5)) / number
+    print(f'{name}: {len(actual)} rows, BeautifulSoup {bs4_time * 1000:.2f} ms, lxml {lxml_time * 1000:.2f} ms, x{bs4_time / lxml_time:.1f}')
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Сравнение парсеров BeautifulSoup и lxml на сохранённых страницах')
+    parser.add_argument('--finmarket', nargs='*', default=[], help='сохранённые страницы архива finmarket.ru')
+    parser.add_argument('--iban', nargs='*', default=[], help='сохранённые страницы iban.ru/currency-codes')
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+    finmarket = [(path, open(path, 'rb').read()) for path in args.finmarket]
+    iban = [(path, open(path, 'rb').read()) for path in args.iban]
+    if not finmarket:
+        finmarket = [('synthetic finmarket 730 days', synthetic_exchange_rates_page(730))]
+    if not iban:
+        iban = [('synthetic iban 280 rows', synthetic_currency_codes_page(280))]
+    for name, content in finmarket:
+        measure(name, lambda: bs4_exchange_rates('USD', content), lambda: ExchangeRateParser('USD').parse(content), args.number)
+    for name, content in iban:
+        measure(name, lambda: bs4_currency_codes(content), lambda: CurrencyCodeParser().parse(content), args.number)
+
+
+if __name__ == '__main__':
+    main()
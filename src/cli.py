@@ -0,0 +1,81 @@
+import logging
+import sys
+from argparse import ArgumentParser, Namespace
+from datetime import date
+from time import perf_counter
+from config.config import new_config
+from internal.adapter.db.sqlite.coverage import CoverageStorage
+from internal.adapter.file.exchange_rate import ExchangeRateFile
+from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
+from internal.adapter.db.sqlite.parameter import parameterStorage
+from internal.controller.export import ExportHandler
+from internal.domain.usecase.exchange_rate import ExchangeRateUsecase
+from pkg.logging.logging import get_logger
+from pkg.sqlite.sqlite import SQLite
+
+
+def export(args: Namespace) -> None:
+    cfg = new_config()
+    logger = get_logger('cli.logger', 'INFO')
+    sqlite = SQLite(cfg.sqlite)
+    sqlite.setup_database()
+    sqlite.set_std_date(cfg.sqlite.std_date)
+    usecaseExchangeRate = ExchangeRateUsecase(ExchangeRateStorage(sqlite, logger), parameterStorage(sqlite, logger), CoverageStorage(sqlite, logger), None, cfg.sqlite.batch_size)
+    handlerExport = ExportHandler(usecaseExchangeRate, cfg.export)
+    codes = [code.strip().upper() for code in args.codes.split(',') if code.strip()] if args.codes else None
+    stream = handlerExport.stream(codes, args.start, args.end, args.mode, args.std_date, args.format)
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    size = 0
+    try:
+        for chunk in stream:
+            output.write(chunk)
+            size += len(chunk)
+    finally:
+        if args.output:
+            output.close()
+    logger.info(f'Exported {size} bytes as {args.format}')
+
+
+def import_file(args: Namespace) -> None:
+    cfg = new_config()
+    logger = get_logger('cli.logger', 'INFO')
+    sqlite = SQLite(cfg.sqlite)
+    sqlite.setup_database()
+    sqlite.set_std_date(cfg.sqlite.std_date)
+    usecaseExchangeRate = ExchangeRateUsecase(ExchangeRateStorage(sqlite, logger), parameterStorage(sqlite, logger), CoverageStorage(sqlite, logger), None, cfg.sqlite.batch_size)
+    fileExchangeRate = ExchangeRateFile(logger)
+    start = perf_counter()
+    def progress(count: int) -> None:
+        logger.info(f'Imported {count} rows, {count / (perf_counter() - start):.0f} rows/s')
+    count = usecaseExchangeRate.import_data(fileExchangeRate.iter_series(args.path, args.format, cfg.bulk_import.chunk_size), cfg.bulk_import.rebuild_threshold, args.mark_covered, progress)
+    elapsed = perf_counter() - start
+    logger.info(f"Imported {count} rows from '{args.path}' in {elapsed:.1f} s, {count / elapsed:.0f} rows/s")
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Утилиты для работы с базой курсов валют')
+    commands = parser.add_subparsers(dest='command', required=True)
+    parser_export = commands.add_parser('export', help='Потоковая выгрузка истории курсов')
+    parser_export.add_argument('--codes', default=None, help='Коды валют через запятую, по умолчанию все')
+    parser_export.add_argument('--from', dest='start', type=date.fromisoformat, default=date.min)
+    parser_export.add_argument('--to', dest='end', type=date.fromisoformat, default=date.max)
+    parser_export.add_argument('--mode', choices=['abs', 'rel'], default='abs')
+    parser_export.add_argument('--std-date', dest='std_date', type=date.fromisoformat, default=None)
+    parser_export.add_argument('--format', choices=['csv', 'ndjson', 'arrow'], default='csv')
+    parser_export.add_argument('-o', '--output', default=None, help='Файл для выгрузки, по умолчанию stdout')
+    parser_export.set_defaults(handler=export)
+    parser_import = commands.add_parser('import', help='Загрузка истории курсов из файла CSV, NDJSON, Arrow или Parquet')
+    parser_import.add_argument('path', help='Файл со столбцами code, date, count, rate, change')
+    parser_import.add_argument('--format', choices=['csv', 'ndjson', 'arrow', 'parquet'], default=None, help='По умолчанию определяется по расширению файла')
+    parser_import.add_argument('--mark-covered', dest='mark_covered', action='store_true', help='Считать период от первой до последней даты каждой валюты в файле считанным, чтобы не загружать его с сайта')
+    parser_import.set_defaults(handler=import_file)
+    args = parser.parse_args()
+    try:
+        args.handler(args)
+    except Exception as e:
+        logging.fatal(e)
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
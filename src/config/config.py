@@ -15,12 +15,90 @@ class SQLite(DataClassJsonMixin):
     timeout: int = None
     tries: int = None
     std_date: str = None
+    synchronous: str = None
+    cache_size: int = None
+    busy_timeout: int = None
+    batch_size: int = None
+
+
+@dataclass
+class HTTP(DataClassJsonMixin):
+    concurrency: int = None
+    connect_timeout: float = None
+    read_timeout: float = None
+    tries: int = None
+    backoff: float = None
+    backoff_max: float = None
+
+
+@dataclass
+class Cache(DataClassJsonMixin):
+    enabled: bool = None
+    path: str = None
+    max_size: int = None
+    ttl_closed: int = None
+    ttl_open: int = None
+
+
+@dataclass
+class SeriesCache(DataClassJsonMixin):
+    enabled: bool = None
+    max_size: int = None
+
+
+@dataclass
+class Graph(DataClassJsonMixin):
+    max_points: int = None
+    webgl_threshold: int = None
+
+
+@dataclass
+class FigureCache(DataClassJsonMixin):
+    enabled: bool = None
+    max_size: int = None
+
+
+@dataclass
+class Jobs(DataClassJsonMixin):
+    concurrency: int = None
+    history: int = None
+    poll_interval: int = None
+
+
+@dataclass
+class Refresh(DataClassJsonMixin):
+    enabled: bool = None
+    interval: int = None
+    jitter: int = None
+    budget: int = None
+    days: int = None
+    codes: list[str] = None
+
+
+@dataclass
+class Export(DataClassJsonMixin):
+    chunk_size: int = None
+
+
+@dataclass
+class Import(DataClassJsonMixin):
+    chunk_size: int = None
+    rebuild_threshold: int = None
 
 
 @dataclass
 class Config(YamlDataClassConfig):
     app: App = None
     sqlite: SQLite = None
+    http: HTTP = None
+    cache: Cache = None
+    series_cache: SeriesCache = None
+    graph: Graph = None
+    figure_cache: FigureCache = None
+    jobs: Jobs = None
+    refresh: Refresh = None
+    export: Export = None
+    bulk_import: Import = None
 
 
 def new_config(path: str = './config/config.yml') -> Config:
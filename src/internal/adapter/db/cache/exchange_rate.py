@@ -0,0 +1,110 @@
+from logging import Logger
+from threading import Lock
+from typing import Callable, Iterator, Union
+from datetime import date
+from decimal import Decimal
+from internal.domain.entity.exchange_rate import ExchangeRate
+from internal.domain.entity.upsert_result import UpsertResult
+from internal.domain.entity.rate_series import RateSeries
+from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
+from config.config import SeriesCache as Cfg
+from pkg.lru.lru import LRU, Stats
+import numpy as np
+
+
+class ExchangeRateCache:
+    def __init__(self, storage: ExchangeRateStorage, cfg: Cfg, logger: Logger):
+        self.__storage = storage
+        self.__logger = logger
+        self.__series = LRU(cfg.max_size, self.__weigh)
+        self.__generations: dict[str, int] = {}
+        self.__lock = Lock()
+
+    def __weigh(self, entry: tuple[int, RateSeries]) -> int:
+        series = entry[1]
+        return series.Dates.nbytes + series.Counts.nbytes + series.Rates.nbytes + series.Changes.nbytes
+
+    def __invalidate(self, codes: set[str]) -> None:
+        with self.__lock:
+            for code in codes:
+                self.__generations[code] = self.__generations.get(code, 0) + 1
+                self.__series.pop(('series', code))
+
+    def __get_rate_series(self, code: str, version: int) -> RateSeries:
+        hit, entry = self.__series.get(('series', code))
+        if hit and entry[0] == version:
+            return entry[1]
+        if hit:
+            self.__logger.debug(f"Series cache entry '{code}' is stale: revision {entry[0]} != {version}")
+        with self.__lock:
+            generation = self.__generations.get(code, 0)
+        series = self.__storage.get_series([code], date.min, date.max)[0]
+        with self.__lock:
+            if self.__generations.get(code, 0) == generation:
+                self.__series.put(('series', code), (version, series))
+        self.__log_miss(code)
+        return series
+
+    def __log_miss(self, code: str) -> None:
+        stats = self.__series.stats()
+        self.__logger.debug(f"Series cache miss '{code}': hits={stats.hits} misses={stats.misses} items={stats.items} bytes={stats.weight}")
+
+    def stats(self) -> Stats:
+        return self.__series.stats()
+
+    def create_or_update(self, exchangeRate: ExchangeRate) -> ExchangeRate:
+        exchangeRate = self.__storage.create_or_update(exchangeRate)
+        self.__invalidate({exchangeRate.Code})
+        return exchangeRate
+
+    def bulk_upsert(self, exchangeRate_list: list[ExchangeRate]) -> UpsertResult:
+        result = self.__storage.bulk_upsert(exchangeRate_list)
+        if result.Inserted or result.Updated:
+            self.__invalidate({exchangeRate.Code for exchangeRate in exchangeRate_list})
+        return result
+
+    def bulk_load(self, series_iter: Iterator[RateSeries], rebuildThreshold: int, progress: Callable[[int], None] = None) -> int:
+        codes: set[str] = set()
+        def track() -> Iterator[RateSeries]:
+            for series in series_iter:
+                codes.add(series.Code)
+                yield series
+        try:
+            return self.__storage.bulk_load(track(), rebuildThreshold, progress)
+        finally:
+            self.__invalidate(codes)
+
+    def get_one(self, exchangeRate: ExchangeRate) -> ExchangeRate:
+        return self.__storage.get_one(exchangeRate)
+
+    def get_latest(self, exchangeRate: ExchangeRate) -> ExchangeRate:
+        series = self.__get_rate_series(exchangeRate.Code, self.__storage.get_versions([exchangeRate.Code])[exchangeRate.Code])
+        i = int(np.searchsorted(series.Dates, np.datetime64(exchangeRate.Date, 'D'), 'right'))
+        if i == 0:
+            return None
+        return ExchangeRate(
+            Date=series.Dates[i - 1].item(),
+            Count=int(series.Counts[i - 1]),
+            Rate=Decimal(int(series.Rates[i - 1])).scaleb(-series.Scale),
+            Change=Decimal(int(series.Changes[i - 1])).scaleb(-series.Scale),
+            Code=series.Code
+        )
+
+    def get_many(self, exchangeRate: ExchangeRate) -> list[ExchangeRate]:
+        return self.__storage.get_many(exchangeRate)
+
+    def get_series(self, codes: list[str], start: date, end: date) -> list[RateSeries]:
+        versions = self.__storage.get_versions(codes)
+        return [self.__get_rate_series(code, versions[code]).slice(start, end) for code in codes]
+
+    def get_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]:
+        return self.__storage.get_series_page(codes, start, end, after, limit)
+
+    def get_versions(self, codes: list[str]) -> dict[str, int]:
+        return self.__storage.get_versions(codes)
+
+    def iter_series(self, codes: list[str], start: date, end: date, size: int) -> Iterator[RateSeries]:
+        return self.__storage.iter_series(codes, start, end, size)
+
+    def get_codes(self) -> list[str]:
+        return self.__storage.get_codes()
\ No newline at end of file
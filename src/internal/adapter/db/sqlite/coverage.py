@@ -0,0 +1,54 @@
+from internal.adapter.db.sqlite.utils import format_query, coverage_row
+from pkg.sqlite.sqlite import SQLite
+from logging import Logger
+from internal.domain.entity.coverage import Coverage
+from datetime import date, timedelta
+
+
+class CoverageStorage:
+    def __init__(self, sqlite: SQLite, logger: Logger):
+        self.__sqlite = sqlite
+        self.__logger = logger
+
+    def get_many(self, coverage: Coverage) -> list[Coverage]:
+        q = """
+            SELECT id, code, start, end
+            FROM coverages
+            WHERE code = ?
+            ORDER BY start;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        coverage_list: list[Coverage] = self.__sqlite.query(q, (coverage.Code,), coverage_row)
+        return coverage_list
+
+    def create_or_merge(self, coverage: Coverage) -> Coverage:
+        with self.__sqlite.transaction():
+            q = """
+                SELECT MIN(start), MAX(end)
+                FROM coverages
+                WHERE code = ? AND start <= ? AND end >= ?;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            raw_bounds = self.__sqlite.query_row(q, (coverage.Code, str(coverage.End + timedelta(days=1)), str(coverage.Start - timedelta(days=1)),))
+            start = min(str(coverage.Start), raw_bounds[0] or str(coverage.Start))
+            end = max(str(coverage.End), raw_bounds[1] or str(coverage.End))
+            q = """
+                DELETE FROM coverages
+                WHERE code = ? AND start <= ? AND end >= ?;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            self.__sqlite.exec(q, (coverage.Code, str(coverage.End + timedelta(days=1)), str(coverage.Start - timedelta(days=1)),))
+            q = """
+                INSERT INTO coverages (code, start, end)
+                VALUES (?, ?, ?)
+                RETURNING id;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            raw_id = self.__sqlite.query_row(q, (coverage.Code, start, end,))
+        coverage = Coverage(
+            Id=int(raw_id[0]),
+            Code=coverage.Code,
+            Start=date.fromisoformat(start),
+            End=date.fromisoformat(end)
+        )
+        return coverage
\ No newline at end of file
@@ -1,7 +1,9 @@
 from pkg.sqlite.sqlite import SQLite
 from logging import Logger
+from typing import ContextManager
 from internal.domain.entity.currency_code import CurrencyCode
-from internal.adapter.db.sqlite.utils import format_query
+from internal.domain.entity.upsert_result import UpsertResult
+from internal.adapter.db.sqlite.utils import format_query, currency_code_row
 
 
 
@@ -10,6 +12,9 @@ class CurrencyCodeStorage:
         self.__sqlite = sqlite
         self.__logger = logger
 
+    def transaction(self) -> ContextManager[None]:
+        return self.__sqlite.transaction()
+
     def exists(self, currencyCode: CurrencyCode) -> bool:
         q = """
             SELECT EXISTS (
@@ -46,16 +51,21 @@ class CurrencyCodeStorage:
 			WHERE code = ?;
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        raw_currencyCode = self.__sqlite.query_row(q, (currencyCode.Code,))
-        currencyCode = CurrencyCode(
-            Id=int(raw_currencyCode[0]),
-            Country=str(raw_currencyCode[1]),
-            Currency=str(raw_currencyCode[2]),
-            Code=str(raw_currencyCode[3]),
-            Number=int(raw_currencyCode[4])
-        )
+        currencyCode = self.__sqlite.query_row(q, (currencyCode.Code,), currency_code_row)
         return currencyCode
     
+    def get_page(self, after: str, limit: int) -> list[CurrencyCode]:
+        q = """
+            SELECT id, country, currency, code, number
+            FROM currency_codes
+            WHERE code > ?
+            ORDER BY code
+            LIMIT ?;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        currencyCode_list: list[CurrencyCode] = self.__sqlite.query(q, (after, limit,), currency_code_row)
+        return currencyCode_list
+
     def update(self, currencyCode: CurrencyCode) -> None:
         q = """
             UPDATE currency_codes
@@ -83,3 +93,50 @@ class CurrencyCodeStorage:
         )
         return currencyCode
 
+    def bulk_upsert(self, currencyCode_list: list[CurrencyCode]) -> UpsertResult:
+        batch: dict[str, CurrencyCode] = {}
+        for currencyCode in currencyCode_list:
+            batch[currencyCode.Code] = currencyCode
+        if not batch:
+            return UpsertResult()
+        with self.__sqlite.transaction():
+            q = f"""
+                SELECT code, country, currency, number
+                FROM currency_codes
+                WHERE code IN ({', '.join('?' for _ in batch)});
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            stored: dict[str, tuple[str, str, int]] = {}
+            for raw_currencyCode in self.__sqlite.query(q, tuple(batch)):
+                stored[str(raw_currencyCode[0])] = (
+                    str(raw_currencyCode[1]),
+                    str(raw_currencyCode[2]),
+                    int(raw_currencyCode[3]),
+                )
+            inserted = 0
+            updated = 0
+            unchanged = 0
+            args_list: list[tuple] = []
+            for code, currencyCode in batch.items():
+                if code not in stored:
+                    inserted += 1
+                elif stored[code] == (currencyCode.Country, currencyCode.Currency, currencyCode.Number):
+                    unchanged += 1
+                    continue
+                else:
+                    updated += 1
+                args_list.append((currencyCode.Country, currencyCode.Currency, currencyCode.Code, currencyCode.Number,))
+            q = """
+                INSERT INTO currency_codes (country, currency, code, number)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (code) DO UPDATE
+                SET country = excluded.country, currency = excluded.currency, number = excluded.number;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            if args_list:
+                self.__sqlite.exec_many(q, args_list)
+        return UpsertResult(
+            Inserted=inserted,
+            Updated=updated,
+            Unchanged=unchanged
+        )
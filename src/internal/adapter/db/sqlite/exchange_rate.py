@@ -1,9 +1,13 @@
-from internal.adapter.db.sqlite.utils import format_query
+from internal.adapter.db.sqlite.utils import RATE_SCALE, format_query, encode_date, encode_dates, decode_dates, encode_decimal, exchange_rate_row
 from pkg.sqlite.sqlite import SQLite
 from logging import Logger
+from itertools import groupby, repeat
+from typing import Callable, ContextManager, Iterator, Union
 from internal.domain.entity.exchange_rate import ExchangeRate
+from internal.domain.entity.upsert_result import UpsertResult
+from internal.domain.entity.rate_series import RateSeries
 from datetime import date
-from decimal import Decimal
+import numpy as np
 
 
 class ExchangeRateStorage:
@@ -11,6 +15,9 @@ class ExchangeRateStorage:
         self.__sqlite = sqlite
         self.__logger = logger
 
+    def transaction(self) -> ContextManager[None]:
+        return self.__sqlite.transaction()
+
     def exists(self, exchangeRate: ExchangeRate) -> bool:
         q = """
             SELECT EXISTS (
@@ -20,17 +27,17 @@ class ExchangeRateStorage:
 		    );
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        exists = bool(self.__sqlite.query_row(q, (str(exchangeRate.Date), exchangeRate.Code, ))[0])
+        exists = bool(self.__sqlite.query_row(q, (exchangeRate.Date, exchangeRate.Code, ))[0])
         return exists
     
     def create(self, exchangeRate: ExchangeRate) -> ExchangeRate:
         q = """
-            INSERT INTO exchange_rates (date, count, rate, change, code)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO exchange_rates (date, count, rate, change, code, revision)
+            VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(revision), 0) + 1 FROM exchange_rates))
             RETURNING id;
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        raw_id = self.__sqlite.query_row(q, (str(exchangeRate.Date), exchangeRate.Count, str(exchangeRate.Rate), str(exchangeRate.Change), exchangeRate.Code,))
+        raw_id = self.__sqlite.query_row(q, (exchangeRate.Date, exchangeRate.Count, exchangeRate.Rate, exchangeRate.Change, exchangeRate.Code,))
         exchangeRate = ExchangeRate(
             Id=int(raw_id[0]),
             Date=exchangeRate.Date,
@@ -48,27 +55,29 @@ class ExchangeRateStorage:
 			WHERE date = ? AND code = ?;
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        raw_exchangeRate = self.__sqlite.query_row(q, (str(exchangeRate.Date), exchangeRate.Code, ))
-        
-        d = str(raw_exchangeRate[1]).split('-')
-        exchangeRate = ExchangeRate(
-            Id=int(raw_exchangeRate[0]),
-            Date=date(int(d[0]), int(d[1]), int(d[2])),
-            Count=int(raw_exchangeRate[2]),
-            Rate=Decimal(raw_exchangeRate[3]),
-            Change=Decimal(raw_exchangeRate[4]),
-            Code=str(raw_exchangeRate[5]),
-        )
+        exchangeRate = self.__sqlite.query_row(q, (exchangeRate.Date, exchangeRate.Code, ), exchange_rate_row)
+        return exchangeRate
+
+    def get_latest(self, exchangeRate: ExchangeRate) -> ExchangeRate:
+        q = """
+            SELECT id, date, count, rate, change, code
+            FROM exchange_rates
+            WHERE code = ? AND date <= ?
+            ORDER BY date DESC
+            LIMIT 1;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        exchangeRate = self.__sqlite.query_row(q, (exchangeRate.Code, exchangeRate.Date, ), exchange_rate_row)
         return exchangeRate
 
     def update(self, exchangeRate: ExchangeRate) -> None:
         q = """
             UPDATE exchange_rates
-            SET rate = ?, change = ?, count = ?
+            SET rate = ?, change = ?, count = ?, revision = (SELECT COALESCE(MAX(revision), 0) + 1 FROM exchange_rates)
             WHERE date = ? AND code = ?;
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        self.__sqlite.exec(q, (str(exchangeRate.Rate), str(exchangeRate.Change), exchangeRate.Count, str(exchangeRate.Date), exchangeRate.Code,))
+        self.__sqlite.exec(q, (exchangeRate.Rate, exchangeRate.Change, exchangeRate.Count, exchangeRate.Date, exchangeRate.Code,))
 
     def create_or_update(self, exchangeRate: ExchangeRate) -> ExchangeRate:
         if self.exists(exchangeRate) is False:
@@ -88,26 +97,231 @@ class ExchangeRateStorage:
             Code=er.Code
         )
         return exchangeRate
-        
-    
+
+    def bulk_upsert(self, exchangeRate_list: list[ExchangeRate]) -> UpsertResult:
+        batch: dict[tuple[str, int], tuple] = {}
+        for exchangeRate in exchangeRate_list:
+            batch[(exchangeRate.Code, encode_date(exchangeRate.Date))] = (exchangeRate.Count, encode_decimal(exchangeRate.Rate), encode_decimal(exchangeRate.Change))
+        if not batch:
+            return UpsertResult()
+        with self.__sqlite.transaction():
+            q = """
+                SELECT date, count, rate, change
+                FROM exchange_rates
+                WHERE code = ? AND date BETWEEN ? AND ?;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            stored: dict[tuple[str, int], tuple[int, int, int]] = {}
+            for code in {key[0] for key in batch}:
+                dates = [key[1] for key in batch if key[0] == code]
+                raw_exchangeRate_list = self.__sqlite.query(q, (code, min(dates), max(dates),))
+                for raw_exchangeRate in raw_exchangeRate_list:
+                    stored[(code, raw_exchangeRate[0])] = (
+                        int(raw_exchangeRate[1]),
+                        int(raw_exchangeRate[2]),
+                        int(raw_exchangeRate[3]),
+                    )
+            q = """
+                SELECT COALESCE(MAX(revision), 0) + 1
+                FROM exchange_rates;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            revision = int(self.__sqlite.query_row(q)[0])
+            inserted = 0
+            updated = 0
+            unchanged = 0
+            args_list: list[tuple] = []
+            for key, values in batch.items():
+                if key not in stored:
+                    inserted += 1
+                elif stored[key] == values:
+                    unchanged += 1
+                    continue
+                else:
+                    updated += 1
+                args_list.append((key[1], *values, key[0], revision,))
+            q = """
+                INSERT INTO exchange_rates (date, count, rate, change, code, revision)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (code, date) DO UPDATE
+                SET count = excluded.count, rate = excluded.rate, change = excluded.change, revision = excluded.revision;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            if args_list:
+                self.__sqlite.exec_many(q, args_list)
+        return UpsertResult(
+            Inserted=inserted,
+            Updated=updated,
+            Unchanged=unchanged
+        )
+
+    def __drop_indexes(self) -> None:
+        for q in (
+            """
+                DROP INDEX IF EXISTS exchange_rates_code_date;
+            """,
+            """
+                DROP INDEX IF EXISTS exchange_rates_code_revision;
+            """,
+            """
+                DROP INDEX IF EXISTS exchange_rates_revision;
+            """,
+        ):
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            self.__sqlite.exec(q)
+
+    def __rebuild_indexes(self) -> None:
+        for q in (
+            """
+                DELETE FROM exchange_rates
+                WHERE id NOT IN (
+                    SELECT MAX(id)
+                    FROM exchange_rates
+                    GROUP BY code, date
+                );
+            """,
+            """
+                CREATE UNIQUE INDEX IF NOT EXISTS exchange_rates_code_date
+                ON exchange_rates (code, date);
+            """,
+            """
+                CREATE INDEX IF NOT EXISTS exchange_rates_code_revision
+                ON exchange_rates (code, revision);
+            """,
+            """
+                CREATE INDEX IF NOT EXISTS exchange_rates_revision
+                ON exchange_rates (revision);
+            """,
+            """
+                ANALYZE exchange_rates;
+            """,
+        ):
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            self.__sqlite.exec(q)
+
+    def bulk_load(self, series_iter: Iterator[RateSeries], rebuildThreshold: int, progress: Callable[[int], None] = None) -> int:
+        upsert = """
+            INSERT INTO exchange_rates (date, count, rate, change, code, revision)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (code, date) DO UPDATE
+            SET count = excluded.count, rate = excluded.rate, change = excluded.change, revision = excluded.revision
+            WHERE count != excluded.count OR rate != excluded.rate OR change != excluded.change;
+        """
+        insert = """
+            INSERT INTO exchange_rates (date, count, rate, change, code, revision)
+            VALUES (?, ?, ?, ?, ?, ?);
+        """
+        count = 0
+        rebuild = False
+        with self.__sqlite.transaction():
+            q = """
+                SELECT COALESCE(MAX(revision), 0) + 1
+                FROM exchange_rates;
+            """
+            self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+            revision = int(self.__sqlite.query_row(q)[0])
+            for series in series_iter:
+                if not rebuild and count + len(series) > rebuildThreshold:
+                    self.__logger.info(f'Bulk load exceeds {rebuildThreshold} rows: dropping exchange_rates indexes')
+                    self.__drop_indexes()
+                    rebuild = True
+                scale = 10 ** (RATE_SCALE - series.Scale)
+                q = insert if rebuild else upsert
+                self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+                self.__sqlite.exec_many(q, zip(
+                    encode_dates(series.Dates).tolist(),
+                    series.Counts.tolist(),
+                    (series.Rates * scale).tolist(),
+                    (series.Changes * scale).tolist(),
+                    repeat(series.Code),
+                    repeat(revision),
+                ))
+                count += len(series)
+                if progress:
+                    progress(count)
+            if rebuild:
+                self.__logger.info('Rebuilding exchange_rates indexes')
+                self.__rebuild_indexes()
+        return count
+
     def get_many(self, exchangeRate: ExchangeRate) -> list[ExchangeRate]:
         q = """
             SELECT id, date, count, rate, change, code
             FROM exchange_rates
-            WHERE code = ?;
+            WHERE code = ?
+            ORDER BY date;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        exchangeRate_list: list[ExchangeRate] = self.__sqlite.query(q, (exchangeRate.Code,), exchange_rate_row)
+        return exchangeRate_list
+
+    def __to_series(self, code: str, raw_exchangeRate_list: list[tuple]) -> RateSeries:
+        raw_series = np.array(raw_exchangeRate_list, dtype=np.int64).reshape(-1, 4).T.copy()
+        return RateSeries(
+            Code=code,
+            Dates=decode_dates(raw_series[0]),
+            Counts=raw_series[1],
+            Rates=raw_series[2],
+            Changes=raw_series[3],
+            Scale=RATE_SCALE
+        )
+
+    def get_series(self, codes: list[str], start: date, end: date) -> list[RateSeries]:
+        q = """
+            SELECT date, count, rate, change
+            FROM exchange_rates
+            WHERE code = ? AND date BETWEEN ? AND ?
+            ORDER BY date;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        series_list: list[RateSeries] = []
+        for code in codes:
+            series_list.append(self.__to_series(code, self.__sqlite.query(q, (code, start, end,))))
+        return series_list
+
+    def get_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]:
+        q = f"""
+            SELECT code, date, count, rate, change
+            FROM exchange_rates
+            WHERE code IN ({', '.join('?' for _ in codes)}) AND date BETWEEN ? AND ? AND (code, date) > (?, ?)
+            ORDER BY code, date
+            LIMIT ?;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        after_code, after_date = after or ('', date.min)
+        raw_exchangeRate_list = self.__sqlite.query(q, (*codes, start, end, after_code, after_date, limit,))
+        return [self.__to_series(str(code), [raw_exchangeRate[1:] for raw_exchangeRate in group]) for code, group in groupby(raw_exchangeRate_list, lambda raw_exchangeRate: raw_exchangeRate[0])]
+
+    def iter_series(self, codes: list[str], start: date, end: date, size: int) -> Iterator[RateSeries]:
+        q = """
+            SELECT date, count, rate, change
+            FROM exchange_rates
+            WHERE code = ? AND date BETWEEN ? AND ?
+            ORDER BY date;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        for code in codes:
+            for raw_exchangeRate_list in self.__sqlite.query_iter(q, (code, start, end,), size):
+                yield self.__to_series(code, raw_exchangeRate_list)
+
+    def get_codes(self) -> list[str]:
+        q = """
+            SELECT DISTINCT code
+            FROM exchange_rates
+            ORDER BY code;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        return [str(raw_code[0]) for raw_code in self.__sqlite.query(q)]
+
+    def get_versions(self, codes: list[str]) -> dict[str, int]:
+        q = f"""
+            SELECT code, MAX(revision)
+            FROM exchange_rates
+            WHERE code IN ({', '.join('?' for _ in codes)})
+            GROUP BY code;
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        raw_exchangeRate_list = self.__sqlite.query(q, (exchangeRate.Code,))
-        exchangeRate_list: list[ExchangeRate] = []
-        for raw_exchangeRate in raw_exchangeRate_list:
-            d = str(raw_exchangeRate[1]).split('-')
-            exchangeRate = ExchangeRate(
-                Id=int(raw_exchangeRate[0]),
-                Date=date(int(d[0]), int(d[1]), int(d[2])),
-                Count=int(raw_exchangeRate[2]),
-                Rate=Decimal(raw_exchangeRate[3]),
-                Change=Decimal(raw_exchangeRate[4]),
-                Code=str(raw_exchangeRate[5]),
-            )
-            exchangeRate_list.append(exchangeRate)
-        return exchangeRate_list
\ No newline at end of file
+        versions = {code: 0 for code in codes}
+        for raw_version in self.__sqlite.query(q, tuple(codes)):
+            versions[str(raw_version[0])] = int(raw_version[1])
+        return versions
\ No newline at end of file
@@ -1,4 +1,4 @@
-from internal.adapter.db.sqlite.utils import format_query
+from internal.adapter.db.sqlite.utils import format_query, parameter_row
 from pkg.sqlite.sqlite import SQLite
 from logging import Logger
 from internal.domain.entity.parameter import Parameter
@@ -9,6 +9,18 @@ class parameterStorage:
         self.__sqlite = sqlite
         self.__logger = logger
     
+    def exists(self, parameter: Parameter) -> bool:
+        q = """
+            SELECT EXISTS (
+			    SELECT id
+			    FROM parameters
+			    WHERE name = ?
+		    );
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        exists = bool(self.__sqlite.query_row(q, (parameter.Name,))[0])
+        return exists
+
     def create(self, parameter: Parameter) -> Parameter:
         q = """
             INSERT INTO parameters (name, value)
@@ -31,10 +43,22 @@ class parameterStorage:
 			WHERE name = ?
         """
         self.__logger.debug(f"SQL Query: '{format_query(q)}'")
-        raw_parameter = self.__sqlite.query_row(q, (parameter.Name, ))
+        parameter = self.__sqlite.query_row(q, (parameter.Name, ), parameter_row)
+        return parameter
+
+    def create_or_update(self, parameter: Parameter) -> Parameter:
+        q = """
+            INSERT INTO parameters (name, value)
+            VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE
+            SET value = excluded.value
+            RETURNING id;
+        """
+        self.__logger.debug(f"SQL Query: '{format_query(q)}'")
+        raw_id = self.__sqlite.query_row(q, (parameter.Name, parameter.Value,))
         parameter = Parameter(
-            Id=int(raw_parameter[0]),
-            Name=str(raw_parameter[1]),
-            Value=str(raw_parameter[2])
+            Id=int(raw_id[0]),
+            Name=parameter.Name,
+            Value=parameter.Value
         )
         return parameter
\ No newline at end of file
@@ -1,6 +1,63 @@
 from re import compile
+from sqlite3 import Cursor, register_adapter
+from datetime import date
+from decimal import Decimal
+import numpy as np
+from internal.domain.entity.coverage import Coverage
+from internal.domain.entity.currency_code import CurrencyCode
+from internal.domain.entity.exchange_rate import ExchangeRate
+from internal.domain.entity.parameter import Parameter
+
+
+RATE_SCALE = 6
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+RATE_UNIT = Decimal(1).scaleb(-RATE_SCALE)
 
 
 def format_query(query: str) -> str:
     space = compile('\s+')
-    return ' '.join(space.split(query)).strip()
\ No newline at end of file
+    return ' '.join(space.split(query)).strip()
+
+
+def encode_date(d: date) -> int:
+    return d.toordinal()
+
+
+def decode_date(value: int) -> date:
+    return date.fromordinal(value)
+
+
+def encode_decimal(value: Decimal) -> int:
+    return int(value.scaleb(RATE_SCALE).to_integral_value())
+
+
+def decode_decimal(value: int) -> Decimal:
+    return Decimal(value) * RATE_UNIT
+
+
+def decode_dates(values: np.ndarray) -> np.ndarray:
+    return (values - EPOCH_ORDINAL).astype('datetime64[D]')
+
+
+def encode_dates(values: np.ndarray) -> np.ndarray:
+    return values.astype('datetime64[D]').astype(np.int64) + EPOCH_ORDINAL
+
+
+def exchange_rate_row(cursor: Cursor, row: tuple) -> ExchangeRate:
+    return ExchangeRate(row[0], date.fromordinal(row[1]), row[2], Decimal(row[3]) * RATE_UNIT, Decimal(row[4]) * RATE_UNIT, row[5])
+
+
+def currency_code_row(cursor: Cursor, row: tuple) -> CurrencyCode:
+    return CurrencyCode(row[0], row[1], row[2], row[3], row[4])
+
+
+def parameter_row(cursor: Cursor, row: tuple) -> Parameter:
+    return Parameter(row[0], row[1], row[2])
+
+
+def coverage_row(cursor: Cursor, row: tuple) -> Coverage:
+    return Coverage(row[0], row[1], date.fromisoformat(row[2]), date.fromisoformat(row[3]))
+
+
+register_adapter(date, encode_date)
+register_adapter(Decimal, encode_decimal)
\ No newline at end of file
@@ -0,0 +1,103 @@
+from logging import Logger
+from os import path as os_path
+from typing import Iterator
+from internal.domain.entity.rate_series import RateSeries
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+SCALE = 6
+COLUMNS = ['code', 'date', 'count', 'rate', 'change']
+
+
+class ExchangeRateFile:
+    __formats = {
+        '.csv': 'csv',
+        '.ndjson': 'ndjson',
+        '.jsonl': 'ndjson',
+        '.arrows': 'arrow',
+        '.parquet': 'parquet',
+    }
+
+    def __init__(self, logger: Logger):
+        self.__logger = logger
+
+    def __columns(self, names: list[str]) -> dict[str, str]:
+        columns = {name: name.strip().lower() for name in names if name.strip().lower() in COLUMNS}
+        missing = [column for column in COLUMNS if column not in columns.values()]
+        if missing:
+            raise Exception(f"в файле нет столбцов: {', '.join(missing)}")
+        return columns
+
+    def __read_csv(self, path: str, size: int) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(path, chunksize=size, dtype=str, usecols=lambda name: name.strip().lower() in COLUMNS) as reader:
+            for frame in reader:
+                yield frame
+
+    def __read_ndjson(self, path: str, size: int) -> Iterator[pd.DataFrame]:
+        with pd.read_json(path, lines=True, chunksize=size, dtype=False, convert_dates=False) as reader:
+            for frame in reader:
+                yield frame
+
+    def __read_arrow(self, path: str, size: int) -> Iterator[pd.DataFrame]:
+        with pa.OSFile(path, 'rb') as source:
+            for batch in pa.ipc.open_stream(source):
+                yield batch.to_pandas(date_as_object=False)
+
+    def __read_parquet(self, path: str, size: int) -> Iterator[pd.DataFrame]:
+        with pq.ParquetFile(path) as parquet:
+            columns = list(self.__columns(parquet.schema_arrow.names))
+            for batch in parquet.iter_batches(batch_size=size, columns=columns):
+                yield batch.to_pandas(date_as_object=False)
+
+    def __to_series(self, frame: pd.DataFrame, offset: int) -> list[RateSeries]:
+        frame = frame.rename(columns=self.__columns(list(frame.columns)))
+        codes = frame['code'].astype(str).str.strip().str.upper()
+        dates = pd.to_datetime(frame['date'], errors='coerce', format='ISO8601').to_numpy(dtype='datetime64[D]')
+        counts = pd.to_numeric(frame['count'], errors='coerce').to_numpy(dtype=np.float64)
+        rates = pd.to_numeric(frame['rate'], errors='coerce').to_numpy(dtype=np.float64)
+        changes = pd.to_numeric(frame['change'], errors='coerce').to_numpy(dtype=np.float64)
+        checks = {
+            'code': ~codes.str.fullmatch('[A-Z]{3}').to_numpy(dtype=bool),
+            'date': np.isnat(dates),
+            'count': ~np.isfinite(counts) | (counts != np.round(counts)),
+            'rate': ~np.isfinite(rates),
+            'change': ~np.isfinite(changes),
+        }
+        for column, invalid in checks.items():
+            if invalid.any():
+                i = int(np.flatnonzero(invalid)[0])
+                raise Exception(f"некорректное значение столбца {column} в записи {offset + i + 1}: '{frame[column].iloc[i]}'")
+        codes = codes.to_numpy(dtype=str)
+        order = np.argsort(codes, kind='stable')
+        bounds = [0, *(np.flatnonzero(codes[order][1:] != codes[order][:-1]) + 1).tolist(), len(order)]
+        series_list: list[RateSeries] = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            indices = order[start:stop]
+            series_list.append(RateSeries(
+                Code=str(codes[indices[0]]),
+                Dates=dates[indices],
+                Counts=counts[indices].astype(np.int64),
+                Rates=np.round(rates[indices] * 10 ** SCALE).astype(np.int64),
+                Changes=np.round(changes[indices] * 10 ** SCALE).astype(np.int64),
+                Scale=SCALE
+            ))
+        return series_list
+
+    def iter_series(self, path: str, format: str = None, size: int = 50000) -> Iterator[list[RateSeries]]:
+        format = format or self.__formats.get(os_path.splitext(path)[1].lower())
+        if format not in self.__formats.values():
+            raise Exception(f'Формат файла {path} не поддерживается')
+        readers = {
+            'csv': self.__read_csv,
+            'ndjson': self.__read_ndjson,
+            'arrow': self.__read_arrow,
+            'parquet': self.__read_parquet,
+        }
+        offset = 0
+        for frame in readers[format](path, size):
+            yield self.__to_series(frame, offset)
+            offset += len(frame)
+        self.__logger.info(f"Read {offset} rows from '{path}'")
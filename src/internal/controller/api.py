@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from hashlib import sha256
+from typing import Union
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from internal.domain.entity.currency_code import CurrencyCode
+from internal.domain.entity.rate_series import RateSeries
+from internal.domain.usecase.errors import NotFoundError
+import numpy as np
+import orjson
+
+
+class IExchangeRateUsecase(ABC):
+    @abstractmethod
+    def get_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]: pass
+    @abstractmethod
+    def get_delta_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int, std_date: date = None) -> list[RateSeries]: pass
+    @abstractmethod
+    def get_versions(self, codes: list[str]) -> dict[str, int]: pass
+    @abstractmethod
+    def get_std_date(self) -> date: pass
+
+
+class ICurrencyCodeUsecase(ABC):
+    @abstractmethod
+    def get_page(self, after: str, limit: int) -> list[CurrencyCode]: pass
+
+
+class ApiHandler:
+    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, currencyCodeUsecase: ICurrencyCodeUsecase) -> None:
+        self.__exchangeRateUsecase = exchangeRateUsecase
+        self.__currencyCodeUsecase = currencyCodeUsecase
+
+    def __encode_cursor(self, *values: str) -> str:
+        return urlsafe_b64encode('|'.join(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+    def __decode_cursor(self, cursor: str, size: int) -> list[str]:
+        try:
+            values = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8').split('|')
+        except ValueError:
+            values = []
+        if len(values) != size:
+            raise HTTPException(status_code=400, detail='Курсор указан не коректно')
+        return values
+
+    def __etag(self, *parts: object) -> str:
+        return f'"{sha256(repr(parts).encode("utf-8")).hexdigest()[:32]}"'
+
+    def __not_modified(self, request: Request, etag: str) -> bool:
+        header = request.headers.get('if-none-match')
+        if not header:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+        return '*' in tags or etag in tags
+
+    def __parse_codes(self, codes: str) -> list[str]:
+        code_list = sorted({code.strip().upper() for code in codes.split(',') if code.strip()})
+        if not code_list:
+            raise HTTPException(status_code=400, detail='Валюты не указаны')
+        return code_list
+
+    def __get_series_page(self, codes: list[str], start: date, end: date, mode: str, std_date: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]:
+        if mode == 'rel':
+            return self.__exchangeRateUsecase.get_delta_series_page(codes, start, end, after, limit, std_date)
+        return self.__exchangeRateUsecase.get_series_page(codes, start, end, after, limit)
+
+    def __get_rates_page(self, series_list: list[RateSeries], mode: str, limit: int) -> tuple[list[dict], str]:
+        items: list[dict] = []
+        more = False
+        for page in series_list:
+            if len(items) + len(page) > limit:
+                page = page.take(np.arange(limit - len(items)))
+                more = True
+            dates = np.datetime_as_string(page.Dates).tolist()
+            values = page.values().tolist()
+            if mode == 'rel':
+                items.extend({'code': page.Code, 'date': d, 'delta': v} for d, v in zip(dates, values))
+            else:
+                changes = (page.Changes / 10 ** page.Scale).tolist()
+                items.extend({'code': page.Code, 'date': d, 'count': c, 'rate': v, 'change': ch} for d, c, v, ch in zip(dates, page.Counts.tolist(), values, changes))
+        next_cursor = self.__encode_cursor(items[-1]['code'], items[-1]['date']) if more else None
+        return items, next_cursor
+
+    async def __get_rates(self, request: Request, codes: str, start: date, end: date, mode: str, std_date: date, cursor: str, limit: int) -> Response:
+        code_list = self.__parse_codes(codes)
+        if start > end:
+            raise HTTPException(status_code=400, detail='Дата начала отсчёта не должен быть позже даты конца отсчёта')
+        after = None
+        if cursor:
+            code, d = self.__decode_cursor(cursor, 2)
+            try:
+                after = (code, date.fromisoformat(d))
+            except ValueError:
+                raise HTTPException(status_code=400, detail='Курсор указан не коректно')
+        if mode != 'rel':
+            std_date = None
+        elif std_date is None:
+            std_date = await run_in_threadpool(self.__exchangeRateUsecase.get_std_date)
+        versions = await run_in_threadpool(self.__exchangeRateUsecase.get_versions, code_list)
+        etag = self.__etag('rates', code_list, start, end, mode, std_date, cursor, limit, [versions[code] for code in code_list])
+        if self.__not_modified(request, etag):
+            return Response(status_code=304, headers={'ETag': etag})
+        try:
+            series_list = await run_in_threadpool(self.__get_series_page, code_list, start, end, mode, std_date, after, limit + 1)
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        items, next_cursor = self.__get_rates_page(series_list, mode, limit)
+        return ORJSONResponse({'items': items, 'next_cursor': next_cursor}, headers={'ETag': etag})
+
+    async def __get_currency_codes(self, request: Request, cursor: str, limit: int) -> Response:
+        after = self.__decode_cursor(cursor, 1)[0] if cursor else ''
+        currencyCode_list = await run_in_threadpool(self.__currencyCodeUsecase.get_page, after, limit + 1)
+        next_cursor = self.__encode_cursor(currencyCode_list[limit - 1].Code) if len(currencyCode_list) > limit else None
+        body = orjson.dumps({
+            'items': [{
+                'code': currencyCode.Code,
+                'number': currencyCode.Number,
+                'currency': currencyCode.Currency,
+                'country': currencyCode.Country,
+            } for currencyCode in currencyCode_list[:limit]],
+            'next_cursor': next_cursor,
+        })
+        etag = self.__etag('currency-codes', body)
+        if self.__not_modified(request, etag):
+            return Response(status_code=304, headers={'ETag': etag})
+        return Response(content=body, media_type='application/json', headers={'ETag': etag})
+
+    def register(self, app: FastAPI) -> None:
+        router = APIRouter(prefix='/api', default_response_class=ORJSONResponse)
+
+        @router.get('/rates')
+        async def get_rates(
+            request: Request,
+            codes: str = Query(..., description='Коды валют через запятую, например USD,EUR'),
+            start: date = Query(..., alias='from'),
+            end: date = Query(..., alias='to'),
+            mode: str = Query('abs', pattern='^(abs|rel)$'),
+            std_date: date = Query(None),
+            cursor: str = Query(None),
+            limit: int = Query(1000, ge=1, le=10000),
+        ) -> Response:
+            return await self.__get_rates(request, codes, start, end, mode, std_date, cursor, limit)
+
+        @router.get('/currency-codes')
+        async def get_currency_codes(
+            request: Request,
+            cursor: str = Query(None),
+            limit: int = Query(1000, ge=1, le=10000),
+        ) -> Response:
+            return await self.__get_currency_codes(request, cursor, limit)
+
+        app.include_router(router)
\ No newline at end of file
@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from io import BytesIO
+from typing import Iterator
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from config.config import Export as Cfg
+from internal.domain.entity.rate_series import RateSeries
+from internal.domain.usecase.errors import NotFoundError
+import numpy as np
+import orjson
+import pyarrow as pa
+
+
+class IExchangeRateUsecase(ABC):
+    @abstractmethod
+    def get_codes(self) -> list[str]: pass
+    @abstractmethod
+    def iter_series(self, codes: list[str], start: date, end: date, size: int) -> Iterator[RateSeries]: pass
+    @abstractmethod
+    def iter_delta_series(self, codes: list[str], start: date, end: date, size: int, std_date: date = None) -> Iterator[RateSeries]: pass
+
+
+class ExportHandler:
+    __formats = {
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+        'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    }
+
+    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, cfg: Cfg) -> None:
+        self.__exchangeRateUsecase = exchangeRateUsecase
+        self.__cfg = cfg
+
+    def __columns(self, series: RateSeries, mode: str) -> list[list]:
+        columns = [np.datetime_as_string(series.Dates).tolist()]
+        if mode == 'rel':
+            return columns + [series.values().tolist()]
+        return columns + [series.Counts.tolist(), series.values().tolist(), (series.Changes / 10 ** series.Scale).tolist()]
+
+    def __fields(self, mode: str) -> list[str]:
+        if mode == 'rel':
+            return ['code', 'date', 'delta']
+        return ['code', 'date', 'count', 'rate', 'change']
+
+    def __encode_csv(self, series_iter: Iterator[RateSeries], mode: str) -> Iterator[bytes]:
+        yield (','.join(self.__fields(mode)) + '\n').encode('utf-8')
+        for series in series_iter:
+            prefix = f'{series.Code},'
+            yield ''.join(prefix + ','.join(map(str, row)) + '\n' for row in zip(*self.__columns(series, mode))).encode('utf-8')
+
+    def __encode_ndjson(self, series_iter: Iterator[RateSeries], mode: str) -> Iterator[bytes]:
+        fields = self.__fields(mode)
+        for series in series_iter:
+            yield b''.join(orjson.dumps(dict(zip(fields, (series.Code, *row)))) + b'\n' for row in zip(*self.__columns(series, mode)))
+
+    def __encode_arrow(self, series_iter: Iterator[RateSeries], mode: str) -> Iterator[bytes]:
+        schema = pa.schema([
+            ('code', pa.string()),
+            ('date', pa.date32()),
+            *([('delta', pa.float64())] if mode == 'rel' else [('count', pa.int64()), ('rate', pa.float64()), ('change', pa.float64())]),
+        ])
+        sink = BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for series in series_iter:
+                columns = [pa.repeat(series.Code, len(series)), pa.array(series.Dates)]
+                if mode == 'rel':
+                    columns.append(pa.array(series.values()))
+                else:
+                    columns.extend([pa.array(series.Counts), pa.array(series.values()), pa.array(series.Changes / 10 ** series.Scale)])
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        yield sink.getvalue()
+
+    def stream(self, codes: list[str], start: date, end: date, mode: str, std_date: date, format: str) -> Iterator[bytes]:
+        if format not in self.__formats:
+            raise Exception(f'Формат выгрузки {format} не поддерживается')
+        code_list = sorted(set(codes)) if codes else self.__exchangeRateUsecase.get_codes()
+        if mode == 'rel':
+            series_iter = self.__exchangeRateUsecase.iter_delta_series(code_list, start, end, self.__cfg.chunk_size, std_date)
+        else:
+            series_iter = self.__exchangeRateUsecase.iter_series(code_list, start, end, self.__cfg.chunk_size)
+        if format == 'arrow':
+            return self.__encode_arrow(series_iter, mode)
+        if format == 'ndjson':
+            return self.__encode_ndjson(series_iter, mode)
+        return self.__encode_csv(series_iter, mode)
+
+    def register(self, app: FastAPI) -> None:
+        @app.get('/api/export')
+        async def export(
+            codes: str = Query(None, description='Коды валют через запятую, по умолчанию все'),
+            start: date = Query(date.min, alias='from'),
+            end: date = Query(date.max, alias='to'),
+            mode: str = Query('abs', pattern='^(abs|rel)$'),
+            std_date: date = Query(None),
+            format: str = Query('csv', pattern='^(csv|ndjson|arrow)$'),
+        ) -> StreamingResponse:
+            code_list = [code.strip().upper() for code in codes.split(',') if code.strip()] if codes else None
+            try:
+                stream = await run_in_threadpool(self.stream, code_list, start, end, mode, std_date, format)
+            except NotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            media_type, extension = self.__formats[format]
+            return StreamingResponse(stream, media_type=media_type, headers={'Content-Disposition': f'attachment; filename="rates.{extension}"'})
\ No newline at end of file
@@ -1,78 +1,60 @@
 from abc import ABC, abstractmethod
-from decimal import Decimal
-from typing import Union
+from typing import Callable, Hashable, Union
 from fastapi import FastAPI
-from dash import Dash, dcc, html, Input, Output
+from dash import Dash, dcc, html, Input, Output, State, no_update
+from dash.exceptions import PreventUpdate
 from fastapi.middleware.wsgi import WSGIMiddleware
 from datetime import date, datetime, timedelta
-from internal.domain.entity.delta_rate import DeltaRate
-from internal.domain.entity.exchange_rate import ExchangeRate
+from config.config import Graph as Cfg, FigureCache as CacheCfg, Jobs as JobsCfg
+from internal.domain.entity.rate_series import RateSeries
+from internal.domain.usecase.errors import NotFoundError
+from pkg.jobs.jobs import Job
+from pkg.lttb.lttb import lttb
+from pkg.lru.lru import LRU
 import plotly.graph_objs as go
+import numpy as np
+import orjson
 
 class IExchangeRateUsecase(ABC):
     @abstractmethod
-    def read_GBP_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
+    def read_data(self, codes: list[str], start: date, end: date, progress: Callable[[int], None] = None) -> None: pass
     @abstractmethod
-    def read_USD_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
+    def read_baseline_data(self, codes: list[str], std_date: date = None, progress: Callable[[int], None] = None) -> None: pass
     @abstractmethod
-    def read_TRY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
+    def get_series(self, codes: list[str], start: date, end: date) -> list[RateSeries]: pass
     @abstractmethod
-    def read_EUR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
+    def get_delta_series(self, codes: list[str], start: date, end: date, std_date: date = None) -> list[RateSeries]: pass
     @abstractmethod
-    def read_CNY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_INR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_JPY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def create_delta_GBP_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_USD_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_TRY_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_EUR_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_CNY_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_INR_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_JPY_data(self) -> None: pass
-    @abstractmethod
-    def get_GBP_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_USD_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_TRY_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_EUR_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_CNY_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_INR_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_JPY_data(self) -> list[ExchangeRate]: pass
-    @abstractmethod
-    def get_delta_GBP_data(self) -> list[DeltaRate]: pass
-    @abstractmethod
-    def get_delta_USD_data(self) -> list[DeltaRate]: pass
-    @abstractmethod
-    def get_delta_TRY_data(self) -> list[DeltaRate]: pass
-    @abstractmethod
-    def get_delta_EUR_data(self) -> list[DeltaRate]: pass
-    @abstractmethod
-    def get_delta_CNY_data(self) -> list[DeltaRate]: pass
+    def get_std_date(self) -> date: pass
     @abstractmethod
-    def get_delta_INR_data(self) -> list[DeltaRate]: pass
+    def get_versions(self, codes: list[str]) -> dict[str, int]: pass
+
+
+class IJobs(ABC):
     @abstractmethod
-    def get_delta_JPY_data(self) -> list[DeltaRate]: pass
+    def submit(self, key: Hashable, fn: Callable[[Callable[[int], None]], None]) -> str: pass
     @abstractmethod
-    def get_std_date(self) -> date: pass
+    def get(self, id: str) -> Job: pass
 
 
 class GraphHandler:
-    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase) -> None:
+    __labels = {
+        'GBP': 'Фунт Стерлингов',
+        'USD': 'Доллар США',
+        'TRY': 'Турецкая лира',
+        'EUR': 'Евро',
+        'CNY': 'Китайский юань',
+        'INR': 'Индийская рупия',
+        'JPY': 'Йена',
+    }
+
+    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, jobs: IJobs, cfg: Cfg, cacheCfg: CacheCfg, jobsCfg: JobsCfg) -> None:
         self.__exchangeRateUsecase = exchangeRateUsecase
+        self.__jobs = jobs
+        self.__jobsCfg = jobsCfg
+        self.__cfg = cfg
+        self.__cacheCfg = cacheCfg
+        self.__figures = LRU(cacheCfg.max_size, len)
         self.__n_clicks = 0
 
     def __generate_std_layout(self) -> html.Div:
@@ -105,11 +87,19 @@ class GraphHandler:
             dcc.RadioItems(
                 id='my-radio-1',
                 options=[
-                    {'label': f'Относительные значения валют от {d.day}.{d.month}.{d.year}', 'value': 'REL'},
+                    {'label': 'Относительные значения валют от базовой даты', 'value': 'REL'},
                     {'label': 'Абсолютные значения валют', 'value': 'ABS'}
                 ],
                 inline=True
             ),
+            html.H4('Выбор базовой даты для относительных значений:'),
+            dcc.DatePickerSingle(
+                id='my-date-picker-std',
+                min_date_allowed=date(1992, 1, 1),
+                max_date_allowed=datetime.now().date() - timedelta(days=1),
+                display_format='DD.MM.YYYY',
+                date=d,
+            ),
             html.H4('Выбор источника данных:'),
             dcc.RadioItems(
                 id='my-radio-2',
@@ -124,172 +114,102 @@ class GraphHandler:
                 id='my-button',
                 children='Построить график',
                 n_clicks=self.__n_clicks),
-            html.Div(id='my-output')
+            html.Div(id='my-output'),
+            dcc.Store(id='my-job'),
+            dcc.Interval(id='my-interval', interval=self.__jobsCfg.poll_interval, disabled=True)
         ])
         return layout
 
-    def __get_graph(self, start_date: date, end_date: date, codes: list[str], type: str, source: str) -> html.Div:
-        if (source == 'WEB'):
-            if ('GBP' in codes):
-                self.__exchangeRateUsecase.read_GBP_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('USD' in codes):
-                self.__exchangeRateUsecase.read_USD_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('TRY' in codes):
-                self.__exchangeRateUsecase.read_TRY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('EUR' in codes):
-                self.__exchangeRateUsecase.read_EUR_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('CNY' in codes):
-                self.__exchangeRateUsecase.read_CNY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('INR' in codes):
-                self.__exchangeRateUsecase.read_INR_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-            if ('JPY' in codes):
-                self.__exchangeRateUsecase.read_JPY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if (type == 'REL'):
-            if ('GBP' in codes):
-                self.__exchangeRateUsecase.create_delta_GBP_data()
-            if ('USD' in codes):
-                self.__exchangeRateUsecase.create_delta_USD_data()
-            if ('TRY' in codes):
-                self.__exchangeRateUsecase.create_delta_TRY_data()
-            if ('EUR' in codes):
-                self.__exchangeRateUsecase.create_delta_EUR_data()
-            if ('CNY' in codes):
-                self.__exchangeRateUsecase.create_delta_CNY_data()
-            if ('INR' in codes):
-                self.__exchangeRateUsecase.create_delta_INR_data()
-            if ('JPY' in codes):
-                self.__exchangeRateUsecase.create_delta_JPY_data()
-        labels: list[str] = []
-        data_x: list[list[Decimal]] = []
-        data_y: list[list[date]] = []
+    def __get_series(self, start_date: date, end_date: date, codes: list[str], type: str, std_date: date) -> list[RateSeries]:
         if (type == 'REL'):
-            if ('GBP' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_GBP_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Фунт Стерлингов')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('USD' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_USD_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Доллар США')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('TRY' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_TRY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Турецкая лира')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('EUR' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_EUR_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Евро')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('CNY' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_CNY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Китайский юань')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('INR' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_INR_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Индийская рупия')
-                data_x.append(deltas)
-                data_y.append(dates)
-            if ('JPY' in codes):
-                all_data = self.__exchangeRateUsecase.get_delta_JPY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                deltas = [item.Delta for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Йена')
-                data_x.append(deltas)
-                data_y.append(dates)  
-        else:
-            if ('GBP' in codes):
-                all_data = self.__exchangeRateUsecase.get_GBP_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Фунт Стерлингов')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('USD' in codes):
-                all_data = self.__exchangeRateUsecase.get_USD_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Доллар США')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('TRY' in codes):
-                all_data = self.__exchangeRateUsecase.get_TRY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Турецкая лира')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('EUR' in codes):
-                all_data = self.__exchangeRateUsecase.get_EUR_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Евро')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('CNY' in codes):
-                all_data = self.__exchangeRateUsecase.get_CNY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Китайский юань')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('INR' in codes):
-                all_data = self.__exchangeRateUsecase.get_INR_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Индийская рупия')
-                data_x.append(rates)
-                data_y.append(dates)
-            if ('JPY' in codes):
-                all_data = self.__exchangeRateUsecase.get_JPY_data()
-                data = [item for item in all_data if item.Date >= start_date and item.Date <= end_date]
-                rates = [item.Rate for item in data]
-                dates = [item.Date for item in data]
-                labels.append('Йена')
-                data_x.append(rates)
-                data_y.append(dates) 
+            return self.__exchangeRateUsecase.get_delta_series(codes, start_date, end_date, std_date)
+        return self.__exchangeRateUsecase.get_series(codes, start_date, end_date)
+
+    def __downsample(self, series: RateSeries) -> RateSeries:
+        if (len(series) <= self.__cfg.max_points):
+            return series
+        return series.take(lttb(series.Dates.astype(np.int64), series.Rates, self.__cfg.max_points))
+
+    def __get_figure(self, series_list: list[RateSeries], codes: list[str]) -> go.Figure:
+        data = {series.Code: self.__downsample(series) for series in series_list}
+        points = sum(len(series) for series in data.values())
+        scatter = go.Scattergl if points > self.__cfg.webgl_threshold else go.Scatter
         fig = go.Figure()
-        for i in range(len(labels)):
-            fig.add_scatter(y=data_x[i], x=data_y[i], name=labels[i])
+        for code, label in self.__labels.items():
+            if (code in codes):
+                fig.add_trace(scatter(y=data[code].values(), x=data[code].Dates, name=label))
         fig.update_layout(
             title='График изменения курса валют',
             xaxis_title="Дата",
             yaxis_title="Курс валют",
-            legend_title="Название валют"
+            legend_title="Название валют",
+            uirevision='my-graph'
         )
-        graph = dcc.Graph(figure=fig)
-        div = html.Div(graph)
+        return fig
+
+    def __get_figure_json(self, start_date: date, end_date: date, codes: list[str], type: str, std_date: date) -> orjson.Fragment:
+        codes = sorted(set(codes))
+        versions = self.__exchangeRateUsecase.get_versions(codes)
+        key = (tuple(codes), start_date, end_date, type, std_date if type == 'REL' else None, tuple(versions[code] for code in codes))
+        if (self.__cacheCfg.enabled):
+            hit, payload = self.__figures.get(key)
+            if (hit):
+                return orjson.Fragment(payload)
+        series_list = self.__get_series(start_date, end_date, codes, type, std_date)
+        payload = orjson.dumps(self.__get_figure(series_list, codes).to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY)
+        if (self.__cacheCfg.enabled):
+            self.__figures.put(key, payload)
+        return orjson.Fragment(payload)
+
+    def __get_graph(self, start_date: date, end_date: date, codes: list[str], type: str, std_date: date) -> html.Div:
+        try:
+            figure = self.__get_figure_json(start_date, end_date, codes, type, std_date)
+        except NotFoundError as e:
+            return html.Div([
+                html.Br(),
+                'Ошибки:',
+                html.Ul(html.Li(str(e)))
+            ])
+        graph = dcc.Graph(id='my-graph', figure=figure)
+        query = dcc.Store(id='my-graph-query', data={
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'codes': codes,
+            'type': type,
+            'std_date': std_date.isoformat() if std_date else None,
+        })
+        div = html.Div([graph, query])
         return div
 
-    def __validate(self, start_date: str, end_date: str, value: list[str], value_radio_1: str, value_radio_2: str) -> Union[html.Div, None]:
+    def __get_window(self, relayoutData: dict) -> Union[tuple[date, date], None]:
+        if (relayoutData.get('xaxis.autorange')):
+            return None
+        if ('xaxis.range[0]' in relayoutData and 'xaxis.range[1]' in relayoutData):
+            window = (relayoutData['xaxis.range[0]'], relayoutData['xaxis.range[1]'])
+        elif ('xaxis.range' in relayoutData):
+            window = tuple(relayoutData['xaxis.range'])
+        else:
+            raise PreventUpdate
+        return date.fromisoformat(str(window[0])[:10]) - timedelta(days=1), date.fromisoformat(str(window[1])[:10]) + timedelta(days=1)
+
+    def __zoom(self, relayoutData: dict, query: dict) -> orjson.Fragment:
+        if (not relayoutData or not query):
+            raise PreventUpdate
+        start_date = date.fromisoformat(query['start_date'])
+        end_date = date.fromisoformat(query['end_date'])
+        window = self.__get_window(relayoutData)
+        if (window):
+            start_date = max(start_date, window[0])
+            end_date = min(end_date, window[1])
+        if (start_date >= end_date):
+            raise PreventUpdate
+        std_date = date.fromisoformat(query['std_date']) if query['std_date'] else None
+        try:
+            return self.__get_figure_json(start_date, end_date, query['codes'], query['type'], std_date)
+        except NotFoundError:
+            raise PreventUpdate
+
+    def __validate(self, start_date: str, end_date: str, value: list[str], value_radio_1: str, value_radio_2: str, std_date: str) -> Union[html.Div, None]:
         errors: list[str] = []
         if (not start_date):
             errors.append('Дата начала отсчёта указана не коректно')
@@ -304,12 +224,12 @@ class GraphHandler:
                 errors.append('Дата начала отсчёта не должен быть позже даты конца отсчёта')
             if (start_date == end_date):
                 errors.append('Дата начала отсчёта не должен быть равна дате конца отсчёта')
-            if (end_date - start_date > timedelta(days=365*2)):
-                errors.append('Переод отсчёта не должен превышать два года')
         if (not value):
             errors.append('Валюты для считывания не выбраны')
         if(not value_radio_1):
             errors.append('Выбор типа графика не указан')
+        elif(value_radio_1 == 'REL' and not std_date):
+            errors.append('Базовая дата для относительных значений не указана')
         if(not value_radio_2):
             errors.append('Выбор источника данных не указан')
         if (errors):
@@ -323,28 +243,95 @@ class GraphHandler:
             ])
         return None
 
-    def __callback(self, start_date: str, end_date: str, value: list[str], value_radio_1: str, value_radio_2: str, n_clicks: int) -> html.Div:
+    def __get_status(self, job: dict) -> tuple[html.Div, bool]:
+        jobs = [self.__jobs.get(id) for id in job['ids']]
+        if (any(j is None for j in jobs)):
+            return html.Div([html.Br(), 'Задание не найдено']), True
+        errors = [j.error for j in jobs if j.status == 'failed']
+        if (errors):
+            return html.Div([
+                html.Br(),
+                'Ошибки:',
+                html.Ul([html.Li(error) for error in errors])
+            ]), True
+        if (all(j.status == 'done' for j in jobs)):
+            query = job['query']
+            return self.__get_graph(
+                date.fromisoformat(query['start_date']),
+                date.fromisoformat(query['end_date']),
+                query['codes'],
+                query['type'],
+                date.fromisoformat(query['std_date']) if query['std_date'] else None
+            ), True
+        if (all(j.status == 'pending' for j in jobs)):
+            return html.Div([html.Br(), 'Задание ожидает выполнения']), False
+        return html.Div([html.Br(), f'Задание выполняется, считано курсов: {sum(j.progress for j in jobs)}']), False
+
+    def __poll(self, n_intervals: int, job: dict) -> tuple[html.Div, bool]:
+        if (not job):
+            raise PreventUpdate
+        return self.__get_status(job)
+
+    def __callback(self, start_date: str, end_date: str, value: list[str], value_radio_1: str, value_radio_2: str, std_date: str, n_clicks: int) -> tuple[html.Div, dict, bool]:
         if (n_clicks == self.__n_clicks):
-            return html.Div()
+            return html.Div(), no_update, no_update
         self.__n_clicks = n_clicks
-        err = self.__validate(start_date, end_date, value, value_radio_1, value_radio_2)
+        err = self.__validate(start_date, end_date, value, value_radio_1, value_radio_2, std_date)
         if (err):
-            return err
-        return self.__get_graph(date.fromisoformat(start_date), date.fromisoformat(end_date),value, value_radio_1, value_radio_2)
+            return err, None, True
+        start_date = date.fromisoformat(start_date)
+        end_date = date.fromisoformat(end_date)
+        std_date = date.fromisoformat(std_date) if std_date else None
+        if (value_radio_2 != 'WEB'):
+            return self.__get_graph(start_date, end_date, value, value_radio_1, std_date), None, True
+        ids = [self.__jobs.submit(('exchange_rates', tuple(sorted(value)), start_date, end_date), lambda progress: self.__exchangeRateUsecase.read_data(value, start_date, end_date, progress))]
+        if (value_radio_1 == 'REL'):
+            ids.append(self.__jobs.submit(('baseline', tuple(sorted(value)), std_date), lambda progress: self.__exchangeRateUsecase.read_baseline_data(value, std_date, progress)))
+        job = {
+            'ids': ids,
+            'query': {
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+                'codes': value,
+                'type': value_radio_1,
+                'std_date': std_date.isoformat() if std_date else None,
+            }
+        }
+        return self.__get_status(job)[0], job, False
         
     def register(self, app: FastAPI) -> None:
-        appDash = Dash(requests_pathname_prefix='/graph/')
+        appDash = Dash(requests_pathname_prefix='/graph/', suppress_callback_exceptions=True)
         appDash.layout = self.__generate_std_layout()
         @appDash.callback(
             Output('my-output', 'children'),
+            Output('my-job', 'data'),
+            Output('my-interval', 'disabled'),
             Input('my-date-picker-range', 'start_date'),
             Input('my-date-picker-range', 'end_date'),
             Input('my-checklist', 'value'),
             Input('my-radio-1', 'value'),
             Input('my-radio-2', 'value'),
+            Input('my-date-picker-std', 'date'),
             Input('my-button', 'n_clicks'),
         )
-        def callback(start_date: str, end_date: str, value: list[str], value_radio_1: str , value_radio_2: str, n_clicks: int) -> html.Div:
-            return self.__callback(start_date, end_date, value, value_radio_1, value_radio_2, n_clicks)
+        def callback(start_date: str, end_date: str, value: list[str], value_radio_1: str , value_radio_2: str, std_date: str, n_clicks: int) -> tuple[html.Div, dict, bool]:
+            return self.__callback(start_date, end_date, value, value_radio_1, value_radio_2, std_date, n_clicks)
+        @appDash.callback(
+            Output('my-output', 'children', allow_duplicate=True),
+            Output('my-interval', 'disabled', allow_duplicate=True),
+            Input('my-interval', 'n_intervals'),
+            State('my-job', 'data'),
+            prevent_initial_call=True,
+        )
+        def poll(n_intervals: int, job: dict) -> tuple[html.Div, bool]:
+            return self.__poll(n_intervals, job)
+        @appDash.callback(
+            Output('my-graph', 'figure'),
+            Input('my-graph', 'relayoutData'),
+            State('my-graph-query', 'data'),
+            prevent_initial_call=True,
+        )
+        def zoom(relayoutData: dict, query: dict) -> orjson.Fragment:
+            return self.__zoom(relayoutData, query)
         grapgApp = WSGIMiddleware(appDash.server)
         app.mount('/graph/', grapgApp)
\ No newline at end of file
@@ -1,39 +1,19 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Hashable
 from fastapi import FastAPI
-from dash import Dash, dcc, html, Input, Output
+from dash import Dash, dcc, html, Input, Output, State, no_update
+from dash.exceptions import PreventUpdate
 from fastapi.middleware.wsgi import WSGIMiddleware
 from datetime import date, datetime, timedelta
+from config.config import Jobs as Cfg
+from pkg.jobs.jobs import Job
 
 
 class IExchangeRateUsecase(ABC):
     @abstractmethod
-    def read_GBP_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
+    def read_data(self, codes: list[str], start: date, end: date, progress: Callable[[int], None] = None) -> None: pass
     @abstractmethod
-    def read_USD_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_TRY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_EUR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_CNY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_INR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def read_JPY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None: pass
-    @abstractmethod
-    def create_delta_GBP_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_USD_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_TRY_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_EUR_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_CNY_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_INR_data(self) -> None: pass
-    @abstractmethod
-    def create_delta_JPY_data(self) -> None: pass
+    def read_baseline_data(self, codes: list[str], std_date: date = None, progress: Callable[[int], None] = None) -> None: pass
 
 
 class ICurrencyCodeUsecase(ABC):
@@ -41,10 +21,19 @@ class ICurrencyCodeUsecase(ABC):
     def read_data_from_web(self) -> None: pass
 
 
+class IJobs(ABC):
+    @abstractmethod
+    def submit(self, key: Hashable, fn: Callable[[Callable[[int], None]], None]) -> str: pass
+    @abstractmethod
+    def get(self, id: str) -> Job: pass
+
+
 class ReaderHandler:
-    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, currencyCodeUsecase: ICurrencyCodeUsecase) -> None:
+    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, currencyCodeUsecase: ICurrencyCodeUsecase, jobs: IJobs, cfg: Cfg) -> None:
         self.__exchangeRateUsecase = exchangeRateUsecase
         self.__currencyCodeUsecase = currencyCodeUsecase
+        self.__jobs = jobs
+        self.__cfg = cfg
         self.__n_clicks_1 = 0
         self.__n_clicks_2 = 0
         
@@ -77,13 +66,15 @@ class ReaderHandler:
             html.Br(),
             html.Div([
                 html.Button(children='Считать', id='my-button-1', n_clicks=self.__n_clicks_1),
-                html.Button(children='Расчитать относительные изменения', id='my-button-2', n_clicks=self.__n_clicks_2),
+                html.Button(children='Считать курсы на базовую дату', id='my-button-2', n_clicks=self.__n_clicks_2),
             ]),
-            html.Div(id='my-output')
+            html.Div(id='my-output'),
+            dcc.Store(id='my-job'),
+            dcc.Interval(id='my-interval', interval=self.__cfg.poll_interval, disabled=True)
         ])
         return layout
 
-    def __read_data(self, start_date: str, end_date: str, value: list[str]) -> html.Div:
+    def __read_data(self, start_date: str, end_date: str, value: list[str]) -> tuple[html.Div, dict, bool]:
         errors: list[str] = []
         if (not value):
             errors.append('Валюты для считывания не выбраны')
@@ -100,8 +91,6 @@ class ReaderHandler:
                 errors.append('Дата начала отсчёта не должен быть позже даты конца отсчёта')
             if (start_date == end_date):
                 errors.append('Дата начала отсчёта не должен быть равна дате конца отсчёта')
-            if (end_date - start_date > timedelta(days=365*2)):
-                errors.append('Переод отсчёта не должен превышать два года')
         if (errors):
             errors_in_li: list[html.Li] = []
             for error in errors:
@@ -110,28 +99,18 @@ class ReaderHandler:
                 html.Br(),
                 'Ошибки:',
                 html.Ul(errors_in_li)
-            ])
-        self.__currencyCodeUsecase.read_data_from_web()
-        if ('GBP' in value):
-            self.__exchangeRateUsecase.read_GBP_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('USD' in value):
-            self.__exchangeRateUsecase.read_USD_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('TRY' in value):
-            self.__exchangeRateUsecase.read_TRY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('EUR' in value):
-            self.__exchangeRateUsecase.read_EUR_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('CNY' in value):
-            self.__exchangeRateUsecase.read_CNY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('INR' in value):
-            self.__exchangeRateUsecase.read_INR_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        if ('JPY' in value):
-            self.__exchangeRateUsecase.read_JPY_data(start_date.day, start_date.month, start_date.year, end_date.day, end_date.month, end_date.year)
-        return html.Div([
-            html.Br(),
-            f'Валюты {", ".join(value)} за период от {start_date.day}.{start_date.month}.{start_date.year} до {end_date.day}.{end_date.month}.{end_date.year} успешно считаны'
-        ])
+            ]), None, True
+        ids = [
+            self.__jobs.submit(('currency_codes',), lambda progress: self.__currencyCodeUsecase.read_data_from_web()),
+            self.__jobs.submit(('exchange_rates', tuple(sorted(value)), start_date, end_date), lambda progress: self.__exchangeRateUsecase.read_data(value, start_date, end_date, progress)),
+        ]
+        job = {
+            'ids': ids,
+            'message': f'Валюты {", ".join(value)} за период от {start_date.day}.{start_date.month}.{start_date.year} до {end_date.day}.{end_date.month}.{end_date.year} успешно считаны'
+        }
+        return self.__get_status(job)[0], job, False
 
-    def __create_delta_data(self, value: list[str]) -> html.Div:
+    def __create_delta_data(self, value: list[str]) -> tuple[html.Div, dict, bool]:
         if (not value):
             return html.Div([
                 html.Br(),
@@ -139,34 +118,43 @@ class ReaderHandler:
                 html.Ul(html.Li(
                     'Валюты для расчёта относительных изменений не выбраны'
                 ))
-            ])
-        if ('GBP' in value):
-            self.__exchangeRateUsecase.create_delta_GBP_data()
-        if ('USD' in value):
-            self.__exchangeRateUsecase.create_delta_USD_data()
-        if ('TRY' in value):
-            self.__exchangeRateUsecase.create_delta_TRY_data()
-        if ('EUR' in value):
-            self.__exchangeRateUsecase.create_delta_EUR_data()
-        if ('CNY' in value):
-            self.__exchangeRateUsecase.create_delta_CNY_data()
-        if ('INR' in value):
-            self.__exchangeRateUsecase.create_delta_INR_data()
-        if ('JPY' in value):
-            self.__exchangeRateUsecase.create_delta_JPY_data()
-        return html.Div([
-            html.Br(),
-            f'Относительные изменения по валютам {", ".join(value)} успешно рассчитаны'
-        ])
-        
-    def __callback(self, start_date: str, end_date: str, value: list[str], n_clicks_1: int, n_clicks_2: int) -> html.Div:
+            ]), None, True
+        job = {
+            'ids': [self.__jobs.submit(('baseline', tuple(sorted(value))), lambda progress: self.__exchangeRateUsecase.read_baseline_data(value))],
+            'message': f'Курсы по валютам {", ".join(value)} на базовую дату успешно считаны'
+        }
+        return self.__get_status(job)[0], job, False
+
+    def __get_status(self, job: dict) -> tuple[html.Div, bool]:
+        jobs = [self.__jobs.get(id) for id in job['ids']]
+        if (any(j is None for j in jobs)):
+            return html.Div([html.Br(), 'Задание не найдено']), True
+        errors = [j.error for j in jobs if j.status == 'failed']
+        if (errors):
+            return html.Div([
+                html.Br(),
+                'Ошибки:',
+                html.Ul([html.Li(error) for error in errors])
+            ]), True
+        if (all(j.status == 'done' for j in jobs)):
+            return html.Div([html.Br(), job['message']]), True
+        if (all(j.status == 'pending' for j in jobs)):
+            return html.Div([html.Br(), 'Задание ожидает выполнения']), False
+        return html.Div([html.Br(), f'Задание выполняется, считано курсов: {sum(j.progress for j in jobs)}']), False
+
+    def __poll(self, n_intervals: int, job: dict) -> tuple[html.Div, bool]:
+        if (not job):
+            raise PreventUpdate
+        return self.__get_status(job)
+
+    def __callback(self, start_date: str, end_date: str, value: list[str], n_clicks_1: int, n_clicks_2: int) -> tuple[html.Div, dict, bool]:
         if (n_clicks_1 != self.__n_clicks_1):
             self.__n_clicks_1 = n_clicks_1
             return self.__read_data(start_date, end_date, value)
         if (n_clicks_2 != self.__n_clicks_2):
             self.__n_clicks_2 = n_clicks_2
             return self.__create_delta_data(value)
-        return html.Div()
+        return html.Div(), no_update, no_update
 
 
     def register(self, app: FastAPI) -> None:
@@ -174,13 +162,24 @@ class ReaderHandler:
         appDash.layout = self.__generate_std_layout()
         @appDash.callback(
             Output('my-output', 'children'),
+            Output('my-job', 'data'),
+            Output('my-interval', 'disabled'),
             Input('my-date-picker-range', 'start_date'),
             Input('my-date-picker-range', 'end_date'),
             Input('my-checklist', 'value'),
             Input('my-button-1', 'n_clicks'),
             Input('my-button-2', 'n_clicks')
         )
-        def callback(start_date: str, end_date: str, value: list[str], n_clicks_1: int, n_clicks_2: int) -> html.Div:
+        def callback(start_date: str, end_date: str, value: list[str], n_clicks_1: int, n_clicks_2: int) -> tuple[html.Div, dict, bool]:
             return self.__callback(start_date, end_date, value, n_clicks_1, n_clicks_2)
+        @appDash.callback(
+            Output('my-output', 'children', allow_duplicate=True),
+            Output('my-interval', 'disabled', allow_duplicate=True),
+            Input('my-interval', 'n_intervals'),
+            State('my-job', 'data'),
+            prevent_initial_call=True,
+        )
+        def poll(n_intervals: int, job: dict) -> tuple[html.Div, bool]:
+            return self.__poll(n_intervals, job)
         readerApp = WSGIMiddleware(appDash.server)
         app.mount('/reader/', readerApp)
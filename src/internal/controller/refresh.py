@@ -0,0 +1,86 @@
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from logging import Logger
+from random import uniform
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Hashable
+from config.config import Refresh as Cfg
+from pkg.jobs.jobs import Job
+
+
+class IExchangeRateUsecase(ABC):
+    @abstractmethod
+    def read_data(self, codes: list[str], start: date, end: date, progress: Callable[[int], None] = None) -> None: pass
+    @abstractmethod
+    def read_baseline_data(self, codes: list[str], std_date: date = None, progress: Callable[[int], None] = None) -> None: pass
+
+
+class ICurrencyCodeUsecase(ABC):
+    @abstractmethod
+    def read_data_from_web(self) -> None: pass
+
+
+class IJobs(ABC):
+    @abstractmethod
+    def submit(self, key: Hashable, fn: Callable[[Callable[[int], None]], None]) -> str: pass
+    @abstractmethod
+    def get(self, id: str) -> Job: pass
+
+
+class RefreshHandler:
+    def __init__(self, exchangeRateUsecase: IExchangeRateUsecase, currencyCodeUsecase: ICurrencyCodeUsecase, jobs: IJobs, cfg: Cfg, logger: Logger) -> None:
+        self.__exchangeRateUsecase = exchangeRateUsecase
+        self.__currencyCodeUsecase = currencyCodeUsecase
+        self.__jobs = jobs
+        self.__cfg = cfg
+        self.__logger = logger
+        self.__stop = Event()
+        self.__thread: Thread = None
+        self.__id: str = None
+
+    def __check(self, deadline: float) -> None:
+        if self.__stop.is_set():
+            raise TimeoutError('Обновление прервано: приложение останавливается')
+        if monotonic() > deadline:
+            raise TimeoutError(f'Обновление прервано: превышен бюджет времени {self.__cfg.budget} с')
+
+    def __refresh(self, progress: Callable[[int], None]) -> None:
+        deadline = monotonic() + self.__cfg.budget
+        def report(count: int) -> None:
+            progress(count)
+            self.__check(deadline)
+        end = date.today()
+        self.__exchangeRateUsecase.read_data(self.__cfg.codes, end - timedelta(days=self.__cfg.days), end, report)
+        self.__check(deadline)
+        self.__exchangeRateUsecase.read_baseline_data(self.__cfg.codes, progress=report)
+        self.__check(deadline)
+        self.__currencyCodeUsecase.read_data_from_web()
+
+    def __tick(self) -> None:
+        id = self.__jobs.submit(('refresh',), self.__refresh)
+        if id == self.__id:
+            self.__logger.warning(f"Refresh skipped: previous run '{id}' is still in progress")
+            return
+        self.__id = id
+
+    def __loop(self) -> None:
+        delay = uniform(0, self.__cfg.jitter)
+        while not self.__stop.wait(delay):
+            self.__tick()
+            delay = self.__cfg.interval + uniform(0, self.__cfg.jitter)
+
+    def start(self) -> None:
+        if not self.__cfg.enabled or self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__thread = Thread(target=self.__loop, name='refresh', daemon=True)
+        self.__thread.start()
+        self.__logger.info(f"Refresh scheduled every {self.__cfg.interval} s for {', '.join(self.__cfg.codes)}")
+
+    def stop(self) -> None:
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
\ No newline at end of file
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from datetime import date
+
+
+@dataclass(frozen=True, slots=True)
+class Coverage:
+    Id: int = None
+    Code: str = None
+    Start: date = None
+    End: date = None
\ No newline at end of file
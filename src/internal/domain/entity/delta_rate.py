@@ -3,7 +3,7 @@ from datetime import date
 from decimal import Decimal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeltaRate:
     Id: int = None
     Date: date = None
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class RateSeries:
+    Code: str = None
+    Dates: np.ndarray = field(default_factory=lambda: np.empty(0, dtype='datetime64[D]'))
+    Counts: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    Rates: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    Changes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    Scale: int = 0
+
+    def __len__(self) -> int:
+        return len(self.Dates)
+
+    def slice(self, start: date, end: date) -> 'RateSeries':
+        i = np.searchsorted(self.Dates, np.datetime64(start, 'D'), 'left')
+        j = np.searchsorted(self.Dates, np.datetime64(end, 'D'), 'right')
+        return RateSeries(
+            Code=self.Code,
+            Dates=self.Dates[i:j],
+            Counts=self.Counts[i:j],
+            Rates=self.Rates[i:j],
+            Changes=self.Changes[i:j],
+            Scale=self.Scale
+        )
+
+    def take(self, indices: np.ndarray) -> 'RateSeries':
+        return RateSeries(
+            Code=self.Code,
+            Dates=self.Dates[indices],
+            Counts=self.Counts[indices],
+            Rates=self.Rates[indices],
+            Changes=self.Changes[indices],
+            Scale=self.Scale
+        )
+
+    def shift(self, baseline: Decimal) -> 'RateSeries':
+        return RateSeries(
+            Code=self.Code,
+            Dates=self.Dates,
+            Counts=self.Counts,
+            Rates=self.Rates - int(baseline.scaleb(self.Scale).to_integral_value()),
+            Changes=self.Changes,
+            Scale=self.Scale
+        )
+
+    def values(self) -> np.ndarray:
+        return self.Rates / 10 ** self.Scale
\ No newline at end of file
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class UpsertResult:
+    Inserted: int = 0
+    Updated: int = 0
+    Unchanged: int = 0
\ No newline at end of file
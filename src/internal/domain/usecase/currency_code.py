@@ -1,20 +1,40 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 from internal.domain.entity.currency_code import CurrencyCode
+from internal.domain.entity.upsert_result import UpsertResult
 
 class ICurrencyCodeStorage(ABC):
     @abstractmethod
     def create_or_update(self, currencyCode: CurrencyCode) -> CurrencyCode: pass
+    @abstractmethod
+    def bulk_upsert(self, currencyCode_list: list[CurrencyCode]) -> UpsertResult: pass
+    @abstractmethod
+    def get_page(self, after: str, limit: int) -> list[CurrencyCode]: pass
 
 class ICurrencyCodeWebAPI(ABC):
     @abstractmethod
-    def get_data(self) -> list[CurrencyCode]: pass
+    def iter_data(self) -> Iterator[CurrencyCode]: pass
 
 class CurrencyCodeUsecase:
-    def __init__(self, currencyCodeStorage: ICurrencyCodeStorage, currencyCodeWebAPI: ICurrencyCodeWebAPI):
+    def __init__(self, currencyCodeStorage: ICurrencyCodeStorage, currencyCodeWebAPI: ICurrencyCodeWebAPI, batchSize: int):
         self.__storage = currencyCodeStorage
         self.__webAPI = currencyCodeWebAPI
+        self.__batchSize = batchSize
+
+    def __validate(self, data: Iterator[CurrencyCode]) -> Iterator[CurrencyCode]:
+        for currencyCode in data:
+            if len(currencyCode.Code) != 3 or currencyCode.Number > 999:
+                raise Exception(f'некорректный код валюты {currencyCode.Code} ({currencyCode.Country})')
+            yield currencyCode
     
     def read_data_from_web(self) -> None:
-        data = self.__webAPI.get_data()
-        for element in data:
-            self.__storage.create_or_update(element)
+        batch: list[CurrencyCode] = []
+        for currencyCode in self.__validate(self.__webAPI.iter_data()):
+            batch.append(currencyCode)
+            if len(batch) >= self.__batchSize:
+                self.__storage.bulk_upsert(batch)
+                batch = []
+        self.__storage.bulk_upsert(batch)
+
+    def get_page(self, after: str, limit: int) -> list[CurrencyCode]:
+        return self.__storage.get_page(after, limit)
\ No newline at end of file
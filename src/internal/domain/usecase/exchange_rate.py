@@ -2,50 +2,64 @@ from abc import ABC, abstractmethod
 from internal.domain.entity.exchange_rate import ExchangeRate
 from internal.domain.entity.parameter import Parameter
 from internal.domain.entity.delta_rate import DeltaRate
+from internal.domain.entity.upsert_result import UpsertResult
+from internal.domain.entity.coverage import Coverage
+from internal.domain.entity.rate_series import RateSeries
+from internal.domain.usecase.errors import NotFoundError
 from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterator, Union
+from pkg.lru.lru import LRU
+import numpy as np
 
 
 class IExchangeRateStorage(ABC):
     @abstractmethod
     def create_or_update(self, exchangeRate: ExchangeRate) -> ExchangeRate: pass
     @abstractmethod
+    def bulk_upsert(self, exchangeRate_list: list[ExchangeRate]) -> UpsertResult: pass
+    @abstractmethod
+    def bulk_load(self, series_iter: Iterator[RateSeries], rebuildThreshold: int, progress: Callable[[int], None] = None) -> int: pass
+    @abstractmethod
     def get_one(self, exchangeRate: ExchangeRate) -> ExchangeRate: pass
     @abstractmethod
-    def get_many(self, exchangeRate: ExchangeRate) -> list[ExchangeRate]: pass
-
-class IExchangeRateWebAPI(ABC):
+    def get_latest(self, exchangeRate: ExchangeRate) -> ExchangeRate: pass
     @abstractmethod
-    def get_GBP_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def get_many(self, exchangeRate: ExchangeRate) -> list[ExchangeRate]: pass
     @abstractmethod
-    def get_USD_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def get_series(self, codes: list[str], start: date, end: date) -> list[RateSeries]: pass
     @abstractmethod
-    def get_TRY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def get_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]: pass
     @abstractmethod
-    def get_EUR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def get_versions(self, codes: list[str]) -> dict[str, int]: pass
     @abstractmethod
-    def get_CNY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def iter_series(self, codes: list[str], start: date, end: date, size: int) -> Iterator[RateSeries]: pass
     @abstractmethod
-    def get_INR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def get_codes(self) -> list[str]: pass
+
+class IExchangeRateWebAPI(ABC):
     @abstractmethod
-    def get_JPY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[ExchangeRate]: pass
+    def iter_ranges(self, ranges: list[tuple[str, date, date]]) -> Iterator[list[ExchangeRate]]: pass
 
 class IParameterStorage(ABC):
     @abstractmethod
     def get_one(self, parameter: Parameter) -> Parameter: pass
 
-class IDeltaRateStorage(ABC):
+class ICoverageStorage(ABC):
     @abstractmethod
-    def create_or_update(self, deltaRate: DeltaRate) -> DeltaRate: pass
+    def get_many(self, coverage: Coverage) -> list[Coverage]: pass
     @abstractmethod
-    def get_many(self, deltaRate: DeltaRate) -> list[DeltaRate]: pass
+    def create_or_merge(self, coverage: Coverage) -> Coverage: pass
 
 class ExchangeRateUsecase:
-    def __init__(self, exchangeRateStorage: IExchangeRateStorage, deltaRateStorage: IDeltaRateStorage, parameterStorage: IParameterStorage, exchangeRateWebAPI: IExchangeRateWebAPI):
+    def __init__(self, exchangeRateStorage: IExchangeRateStorage, parameterStorage: IParameterStorage, coverageStorage: ICoverageStorage, exchangeRateWebAPI: IExchangeRateWebAPI, batchSize: int):
         self.__exchangeRateStorage = exchangeRateStorage
-        self.__deltaRateStorage = deltaRateStorage
         self.__parameterStorage = parameterStorage
+        self.__coverageStorage = coverageStorage
         self.__webAPI = exchangeRateWebAPI
+        self.__batchSize = batchSize
         self.__std_date: date = None
+        self.__baselines = LRU(64)
 
     def __check_std_date(self) -> None:
         if not self.__std_date:
@@ -55,166 +69,153 @@ class ExchangeRateUsecase:
             d = parameter.Value.split('-')
             self.__std_date = date(int(d[0]), int(d[1]), int(d[2]))
     
+    def __validate(self, data: Iterator[list[ExchangeRate]]) -> Iterator[ExchangeRate]:
+        for exchangeRate_list in data:
+            for exchangeRate in exchangeRate_list:
+                if exchangeRate.Count <= 0 or exchangeRate.Rate <= 0:
+                    raise Exception(f'некорректный курс {exchangeRate.Code} за {exchangeRate.Date}')
+                yield exchangeRate
+
+    def __validate_series(self, data: Iterator[list[RateSeries]], spans: dict[str, tuple[date, date]]) -> Iterator[RateSeries]:
+        for series_list in data:
+            for series in series_list:
+                invalid = np.flatnonzero((series.Counts <= 0) | (series.Rates <= 0))
+                if len(invalid):
+                    raise Exception(f'некорректный курс {series.Code} за {series.Dates[invalid[0]]}')
+                if not len(series):
+                    continue
+                start, end = series.Dates.min().item(), series.Dates.max().item()
+                if series.Code in spans:
+                    start, end = min(start, spans[series.Code][0]), max(end, spans[series.Code][1])
+                spans[series.Code] = (start, end)
+                yield series
+
+    def __upsert(self, exchangeRate_list: list[ExchangeRate]) -> None:
+        result = self.__exchangeRateStorage.bulk_upsert(exchangeRate_list)
+        if result.Inserted or result.Updated:
+            self.__baselines.clear()
+
+    def __ingest(self, data: Iterator[list[ExchangeRate]], progress: Callable[[int], None] = None) -> None:
+        batch: list[ExchangeRate] = []
+        count = 0
+        for exchangeRate in self.__validate(data):
+            batch.append(exchangeRate)
+            if len(batch) >= self.__batchSize:
+                self.__upsert(batch)
+                count += len(batch)
+                batch = []
+                if progress:
+                    progress(count)
+        self.__upsert(batch)
+        if progress:
+            progress(count + len(batch))
+    
     def read_GBP_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_GBP_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('GBP', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_USD_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_USD_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('USD', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_TRY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_TRY_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('TRY', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_EUR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_EUR_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('EUR', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_CNY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_CNY_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('CNY', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_INR_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_INR_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('INR', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
     def read_JPY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> None:
         self.__check_std_date()
-        data = self.__webAPI.get_JPY_data(startDay, startMonth, startYear, endDay, endMonth, endYear)
-        for element in data:
-            self.__exchangeRateStorage.create_or_update(element)
+        self.__ingest(self.__webAPI.iter_ranges([('JPY', date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))]))
 
-    def create_delta_GBP_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_GBP_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='GBP'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+    def __get_gaps(self, code: str, start: date, end: date) -> list[tuple[date, date]]:
+        gaps: list[tuple[date, date]] = []
+        gap_start = start
+        for coverage in self.__coverageStorage.get_many(Coverage(Code=code)):
+            if coverage.End < gap_start:
+                continue
+            if coverage.Start > end:
+                break
+            if coverage.Start > gap_start:
+                gaps.append((gap_start, coverage.Start - timedelta(days=1)))
+            gap_start = coverage.End + timedelta(days=1)
+        if gap_start <= end:
+            gaps.append((gap_start, end))
+        return gaps
 
-    def create_delta_USD_data(self) -> None:
+    def read_data(self, codes: list[str], start: date, end: date, progress: Callable[[int], None] = None) -> None:
         self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_USD_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='USD'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+        ranges = [(code, s, e) for code in codes for s, e in self.__get_gaps(code, start, end)]
+        if not ranges:
+            return
+        self.__ingest(self.__webAPI.iter_ranges(ranges), progress)
+        closed = date.today() - timedelta(days=1)
+        for code, s, e in ranges:
+            if s <= min(e, closed):
+                self.__coverageStorage.create_or_merge(Coverage(
+                    Code=code,
+                    Start=s,
+                    End=min(e, closed)
+                ))
 
-    def create_delta_TRY_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_TRY_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='TRY'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
-    
-    def create_delta_EUR_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_EUR_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='EUR'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+    def import_data(self, data: Iterator[list[RateSeries]], rebuildThreshold: int, markCovered: bool = False, progress: Callable[[int], None] = None) -> int:
+        spans: dict[str, tuple[date, date]] = {}
+        count = self.__exchangeRateStorage.bulk_load(self.__validate_series(data, spans), rebuildThreshold, progress)
+        self.__baselines.clear()
+        if not markCovered:
+            return count
+        closed = date.today() - timedelta(days=1)
+        for code, (s, e) in spans.items():
+            if s <= min(e, closed):
+                self.__coverageStorage.create_or_merge(Coverage(
+                    Code=code,
+                    Start=s,
+                    End=min(e, closed)
+                ))
+        return count
 
-    def create_delta_CNY_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_CNY_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='CNY'
+    def __get_baseline(self, code: str, std_date: date) -> Decimal:
+        hit, rate = self.__baselines.get((code, std_date))
+        if hit:
+            return rate
+        exchangeRate = self.__exchangeRateStorage.get_latest(ExchangeRate(
+            Date=std_date,
+            Code=code
         ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+        if exchangeRate is None:
+            raise NotFoundError(f'Курс {code} на базовую дату {std_date} не найден')
+        self.__baselines.put((code, std_date), exchangeRate.Rate)
+        return exchangeRate.Rate
 
-    def create_delta_INR_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_INR_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='INR'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+    def __get_delta(self, exchangeRate_list: list[ExchangeRate], std_date: date) -> list[DeltaRate]:
+        if std_date is None:
+            self.__check_std_date()
+            std_date = self.__std_date
+        baselines = {code: self.__get_baseline(code, std_date) for code in {exchangeRate.Code for exchangeRate in exchangeRate_list}}
+        return [DeltaRate(
+            Id=exchangeRate.Id,
+            Date=exchangeRate.Date,
+            Delta=exchangeRate.Rate - baselines[exchangeRate.Code],
+            Code=exchangeRate.Code
+        ) for exchangeRate in exchangeRate_list]
 
-    def create_delta_JPY_data(self) -> None:
-        self.__check_std_date()
-        start = self.__std_date - timedelta(days=1)
-        end = self.__std_date + timedelta(days=1)
-        self.read_JPY_data(start.day, start.month, start.year, end.day, end.month, end.year)
-        std_exchangeRate = self.__exchangeRateStorage.get_one(ExchangeRate(
-            Date=self.__std_date,
-            Code='JPY'
-        ))
-        exchangeRate_list = self.__exchangeRateStorage.get_many(std_exchangeRate)
-        for exchangeRate in exchangeRate_list:
-            self.__deltaRateStorage.create_or_update(DeltaRate(
-                Date=exchangeRate.Date,
-                Delta=exchangeRate.Rate - std_exchangeRate.Rate,
-                Code=exchangeRate.Code
-            ))
+    def read_baseline_data(self, codes: list[str], std_date: date = None, progress: Callable[[int], None] = None) -> None:
+        if std_date is None:
+            self.__check_std_date()
+            std_date = self.__std_date
+        self.read_data(codes, std_date - timedelta(days=7), std_date, progress)
+        for code in codes:
+            self.__get_baseline(code, std_date)
 
     def get_std_date(self) -> date:
         parameter = self.__parameterStorage.get_one(Parameter(
@@ -258,38 +259,57 @@ class ExchangeRateUsecase:
             Code='JPY'
         ))
 
-    def get_delta_GBP_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='GBP'
-        ))
+    def get_delta_GBP_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_GBP_data(), std_date)
     
-    def get_delta_USD_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='USD'
-        ))
+    def get_delta_USD_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_USD_data(), std_date)
     
-    def get_delta_TRY_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='TRY'
-        ))
+    def get_delta_TRY_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_TRY_data(), std_date)
     
-    def get_delta_EUR_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='EUR'
-        ))
+    def get_delta_EUR_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_EUR_data(), std_date)
     
-    def get_delta_CNY_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='CNY'
-        ))
+    def get_delta_CNY_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_CNY_data(), std_date)
     
-    def get_delta_INR_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='INR'
-        ))
+    def get_delta_INR_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_INR_data(), std_date)
     
-    def get_delta_JPY_data(self) -> list[DeltaRate]:
-        return self.__deltaRateStorage.get_many(DeltaRate(
-            Code='JPY'
-        ))
-    
\ No newline at end of file
+    def get_delta_JPY_data(self, std_date: date = None) -> list[DeltaRate]:
+        return self.__get_delta(self.get_JPY_data(), std_date)
+
+    def get_series(self, codes: list[str], start: date, end: date) -> list[RateSeries]:
+        return self.__exchangeRateStorage.get_series(codes, start, end)
+
+    def get_delta_series(self, codes: list[str], start: date, end: date, std_date: date = None) -> list[RateSeries]:
+        if std_date is None:
+            self.__check_std_date()
+            std_date = self.__std_date
+        return [series.shift(self.__get_baseline(series.Code, std_date)) if len(series) else series for series in self.get_series(codes, start, end)]
+
+    def get_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int) -> list[RateSeries]:
+        return self.__exchangeRateStorage.get_series_page(codes, start, end, after, limit)
+
+    def get_delta_series_page(self, codes: list[str], start: date, end: date, after: Union[tuple[str, date], None], limit: int, std_date: date = None) -> list[RateSeries]:
+        if std_date is None:
+            self.__check_std_date()
+            std_date = self.__std_date
+        return [series.shift(self.__get_baseline(series.Code, std_date)) for series in self.get_series_page(codes, start, end, after, limit)]
+
+    def get_versions(self, codes: list[str]) -> dict[str, int]:
+        return self.__exchangeRateStorage.get_versions(codes)
+
+    def get_codes(self) -> list[str]:
+        return self.__exchangeRateStorage.get_codes()
+
+    def iter_series(self, codes: list[str], start: date, end: date, size: int) -> Iterator[RateSeries]:
+        return self.__exchangeRateStorage.iter_series(codes, start, end, size)
+
+    def iter_delta_series(self, codes: list[str], start: date, end: date, size: int, std_date: date = None) -> Iterator[RateSeries]:
+        if std_date is None:
+            self.__check_std_date()
+            std_date = self.__std_date
+        baselines = {code: self.__get_baseline(code, std_date) for code in codes}
+        return (series.shift(baselines[series.Code]) for series in self.iter_series(codes, start, end, size))
\ No newline at end of file
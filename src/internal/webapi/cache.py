@@ -0,0 +1,140 @@
+from hashlib import sha256
+from json import dumps, loads
+from logging import Logger
+from os import fdopen, makedirs, path, remove, replace, scandir, utime
+from tempfile import mkstemp
+from threading import Lock
+from time import time
+from typing import BinaryIO, Callable, Iterator
+from httpx import Response
+from config.config import Cache as Cfg
+
+
+class ResponseCacheWriter:
+    def __init__(self, url: str, meta: dict, file: BinaryIO, tmp_path: str, commit: Callable[[str, str, dict], None]):
+        self.__commit = commit
+        self.__url = url
+        self.__meta = meta
+        self.__file = file
+        self.__tmp_path = tmp_path
+
+    def write(self, chunk: bytes) -> None:
+        if self.__file is not None:
+            self.__file.write(chunk)
+
+    def commit(self) -> None:
+        if self.__file is None:
+            return
+        self.__file.close()
+        self.__file = None
+        self.__commit(self.__url, self.__tmp_path, self.__meta)
+
+    def discard(self) -> None:
+        if self.__file is None:
+            return
+        self.__file.close()
+        self.__file = None
+        try:
+            remove(self.__tmp_path)
+        except OSError:
+            pass
+
+
+class ResponseCache:
+    def __init__(self, cfg: Cfg, logger: Logger):
+        self.__cfg = cfg
+        self.__logger = logger
+        self.__lock = Lock()
+        if self.__cfg.enabled:
+            makedirs(self.__cfg.path, exist_ok=True)
+
+    def __paths(self, url: str) -> tuple[str, str]:
+        key = sha256(url.encode('utf-8')).hexdigest()
+        return path.join(self.__cfg.path, f'{key}.body'), path.join(self.__cfg.path, f'{key}.json')
+
+    def __read_meta(self, url: str) -> dict:
+        try:
+            with open(self.__paths(url)[1], 'r', encoding='utf-8') as f:
+                return loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def __write_meta(self, url: str, meta: dict) -> None:
+        meta_path = self.__paths(url)[1]
+        with open(f'{meta_path}.tmp', 'w', encoding='utf-8') as f:
+            f.write(dumps(meta))
+        replace(f'{meta_path}.tmp', meta_path)
+
+    def __commit(self, url: str, tmp_path: str, meta: dict) -> None:
+        with self.__lock:
+            replace(tmp_path, self.__paths(url)[0])
+            self.__write_meta(url, meta)
+            self.__evict()
+
+    def __evict(self) -> None:
+        entries = [entry for entry in scandir(self.__cfg.path) if entry.name.endswith('.body')]
+        size = sum(entry.stat().st_size for entry in entries)
+        if size <= self.__cfg.max_size:
+            return
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if size <= self.__cfg.max_size:
+                break
+            size -= entry.stat().st_size
+            for file_path in (entry.path, f'{entry.path[:-len(".body")]}.json'):
+                try:
+                    remove(file_path)
+                except OSError:
+                    pass
+            self.__logger.debug(f"HTTP cache evicted '{entry.name}'")
+
+    def lookup(self, url: str) -> tuple[bool, dict[str, str]]:
+        if not self.__cfg.enabled:
+            return False, {}
+        meta = self.__read_meta(url)
+        if meta is None or not path.exists(self.__paths(url)[0]):
+            return False, {}
+        if time() < meta.get('expires_at', 0):
+            utime(self.__paths(url)[0])
+            self.__logger.debug(f"HTTP cache hit '{url}'")
+            return True, {}
+        headers: dict[str, str] = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return False, headers
+
+    def read(self, url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        with open(self.__paths(url)[0], 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def revalidate(self, url: str, ttl: int) -> None:
+        if not self.__cfg.enabled:
+            return
+        meta = self.__read_meta(url)
+        if meta is None:
+            return
+        meta['stored_at'] = time()
+        meta['expires_at'] = meta['stored_at'] + ttl
+        with self.__lock:
+            self.__write_meta(url, meta)
+            utime(self.__paths(url)[0])
+        self.__logger.debug(f"HTTP cache revalidated '{url}'")
+
+    def writer(self, url: str, response: Response, ttl: int) -> ResponseCacheWriter:
+        stored_at = time()
+        meta = {
+            'url': url,
+            'stored_at': stored_at,
+            'expires_at': stored_at + ttl,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if not self.__cfg.enabled:
+            return ResponseCacheWriter(url, meta, None, None, self.__commit)
+        fd, tmp_path = mkstemp(suffix='.tmp', dir=self.__cfg.path)
+        return ResponseCacheWriter(url, meta, fdopen(fd, 'wb'), tmp_path, self.__commit)
\ No newline at end of file
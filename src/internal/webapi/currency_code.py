@@ -1,36 +1,64 @@
-from requests import get
-from bs4 import BeautifulSoup, Tag
+from abc import ABC, abstractmethod
+from typing import ContextManager, Iterator
+from httpx import Response
 from internal.domain.entity.currency_code import CurrencyCode
+from config.config import Cache
+from internal.webapi.parser import CurrencyCodeParser
+
+
+class IHTTP(ABC):
+    @abstractmethod
+    def stream(self, url: str, headers: dict[str, str] = None) -> ContextManager[Response]: pass
+
+
+class IResponseCacheWriter(ABC):
+    @abstractmethod
+    def write(self, chunk: bytes) -> None: pass
+    @abstractmethod
+    def commit(self) -> None: pass
+    @abstractmethod
+    def discard(self) -> None: pass
+
+
+class IResponseCache(ABC):
+    @abstractmethod
+    def lookup(self, url: str) -> tuple[bool, dict[str, str]]: pass
+    @abstractmethod
+    def read(self, url: str) -> Iterator[bytes]: pass
+    @abstractmethod
+    def revalidate(self, url: str, ttl: int) -> None: pass
+    @abstractmethod
+    def writer(self, url: str, response: Response, ttl: int) -> IResponseCacheWriter: pass
 
 
 class CurrencyCodeWebAPi:
-    def __init__(self):
+    def __init__(self, cacheCfg: Cache, http: IHTTP, cache: IResponseCache):
+        self.__cacheCfg = cacheCfg
+        self.__http = http
+        self.__cache = cache
         self.URL = 'https://www.iban.ru/currency-codes'
-    
-    def __tag_to_dataclass(self, htmlRow: Tag) -> CurrencyCode:
-        cols: list[Tag] = htmlRow.find_all('td')
-        number=cols[3].get_text()
-        if number == '':
-            number = -1
-        else:
-            number = int(number)
-        currencyCode = CurrencyCode(
-            Country=cols[0].get_text(),
-            Currency=cols[1].get_text(),
-            Code=cols[2].get_text(),
-            Number=number
-        )
-        return currencyCode
 
+    def iter_data(self) -> Iterator[CurrencyCode]:
+        parser = CurrencyCodeParser()
+        hit, headers = self.__cache.lookup(self.URL)
+        if not hit:
+            with self.__http.stream(self.URL, headers) as response:
+                if response.status_code != 304:
+                    writer = self.__cache.writer(self.URL, response, self.__cacheCfg.ttl_open)
+                    try:
+                        for chunk in response.iter_bytes():
+                            writer.write(chunk)
+                            yield from parser.feed(chunk)
+                    except BaseException:
+                        writer.discard()
+                        raise
+                    writer.commit()
+                    yield from parser.close()
+                    return
+            self.__cache.revalidate(self.URL, self.__cacheCfg.ttl_open)
+        for chunk in self.__cache.read(self.URL):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+    
     def get_data(self) -> list[CurrencyCode]:
-        response = get(self.URL)
-        bs = BeautifulSoup(response.content, "lxml")
-        table = bs.find('table', attrs={'class': 'table table-bordered downloads tablesorter'})
-        tableBody = table.find('tbody')
-        rows = tableBody.find_all('tr')
-        currencyCodeList: list[CurrencyCode] = []
-        for row in rows:
-            currencyCode = self.__tag_to_dataclass(row)
-            if currencyCode.Code:
-                currencyCodeList.append(currencyCode)
-        return currencyCodeList
\ No newline at end of file
+        return list(self.iter_data())
\ No newline at end of file
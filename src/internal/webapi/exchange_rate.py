@@ -1,11 +1,41 @@
 from datetime import date, timedelta
-from decimal import Decimal
 from enum import Enum
+from abc import ABC, abstractmethod
 from time import localtime
-from requests import get
-from bs4 import BeautifulSoup, Tag
+from asyncio import Queue, Semaphore, ensure_future, gather, new_event_loop
+from typing import AsyncContextManager, AsyncIterator, Iterator
+from httpx import AsyncClient, Response
 from internal.domain.entity.currency_code import CurrencyCode
 from internal.domain.entity.exchange_rate import ExchangeRate
+from config.config import HTTP, Cache
+from internal.webapi.parser import ExchangeRateParser
+
+
+class IHTTP(ABC):
+    @abstractmethod
+    def async_client(self) -> AsyncClient: pass
+    @abstractmethod
+    def stream_async(self, client: AsyncClient, url: str, headers: dict[str, str] = None) -> AsyncContextManager[Response]: pass
+
+
+class IResponseCacheWriter(ABC):
+    @abstractmethod
+    def write(self, chunk: bytes) -> None: pass
+    @abstractmethod
+    def commit(self) -> None: pass
+    @abstractmethod
+    def discard(self) -> None: pass
+
+
+class IResponseCache(ABC):
+    @abstractmethod
+    def lookup(self, url: str) -> tuple[bool, dict[str, str]]: pass
+    @abstractmethod
+    def read(self, url: str) -> Iterator[bytes]: pass
+    @abstractmethod
+    def revalidate(self, url: str, ttl: int) -> None: pass
+    @abstractmethod
+    def writer(self, url: str, response: Response, ttl: int) -> IResponseCacheWriter: pass
 
 
 class ExchangeRateWebAPi:
@@ -43,31 +73,117 @@ class ExchangeRateWebAPi:
 
 
 
-    def __tag_to_dataclass(self, code: str, htmlRow: Tag) -> ExchangeRate:
-        cols: list[Tag] = htmlRow.find_all('td')
-        d = cols[0].get_text().split('.')
-        return ExchangeRate(
-            Date=date(int(d[2]), int(d[1]), int(d[0])),
-            Count=int(cols[1].get_text()),
-            Rate=Decimal(cols[2].get_text().replace(',', '.')),
-            Change=Decimal(cols[3].get_text().replace(',', '.').replace('+', '')),
-            Code=code,
-        )
+    def __ttl(self, end: date) -> int:
+        now = localtime()
+        if end < date(now.tm_year, now.tm_mon, now.tm_mday):
+            return self.__cacheCfg.ttl_closed
+        return self.__cacheCfg.ttl_open
 
     def __get_data(self, currencyCode: CurrencyCodeEnum, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[CurrencyCode]:
-        url = self.__generateURL(currencyCode, startDay, startMonth, startYear, endDay, endMonth, endYear)
-        response = get(url)
-        bs = BeautifulSoup(response.content, "lxml")
-        table = bs.find('table', attrs={'class': 'karramba'})
-        tableBody = table.find('tbody')
-        rows = tableBody.find_all('tr')
-        name = currencyCode.name
-        currencyCodeList: list[CurrencyCode] = []
-        for row in rows:
-            
-            currencyCode = self.__tag_to_dataclass(name, row)
-            currencyCodeList.append(currencyCode)
-        return currencyCodeList
+        self.__generateURL(currencyCode, startDay, startMonth, startYear, endDay, endMonth, endYear)
+        return self.fetch_many([currencyCode.name], date(startYear, startMonth, startDay), date(endYear, endMonth, endDay))
+
+    async def __put(self, queue: Queue, exchangeRateList: list[ExchangeRate]) -> None:
+        if exchangeRateList:
+            await queue.put(exchangeRateList)
+
+    async def __fetch(self, client: AsyncClient, semaphore: Semaphore, queue: Queue, code: str, start: date, end: date) -> None:
+        currencyCode = self.CurrencyCodeEnum[code]
+        url = self.__generateURL(currencyCode, start.day, start.month, start.year, end.day, end.month, end.year)
+        parser = ExchangeRateParser(currencyCode.name)
+        ttl = self.__ttl(end)
+        hit, headers = self.__cache.lookup(url)
+        if not hit:
+            async with semaphore:
+                async with self.__http.stream_async(client, url, headers) as response:
+                    if response.status_code != 304:
+                        writer = self.__cache.writer(url, response, ttl)
+                        try:
+                            async for chunk in response.aiter_bytes():
+                                writer.write(chunk)
+                                await self.__put(queue, list(parser.feed(chunk)))
+                        except BaseException:
+                            writer.discard()
+                            raise
+                        writer.commit()
+                        await self.__put(queue, list(parser.close()))
+                        return
+            self.__cache.revalidate(url, ttl)
+        for chunk in self.__cache.read(url):
+            await self.__put(queue, list(parser.feed(chunk)))
+        await self.__put(queue, list(parser.close()))
+
+    async def __produce(self, client: AsyncClient, semaphore: Semaphore, queue: Queue, code: str, start: date, end: date) -> None:
+        try:
+            await self.__fetch(client, semaphore, queue, code, start, end)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    def __windows(self, start: date, end: date) -> list[tuple[date, date]]:
+        if start > end:
+            raise Exception('Дата начала отсчёта не может быть позже даты конца отсчёта')
+        windows: list[tuple[date, date]] = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=365*2), end)
+            if window_start == window_end:
+                window_start = window_end - timedelta(days=1)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+        return windows
+
+    async def __aiter_ranges(self, ranges: list[tuple[str, date, date]]) -> AsyncIterator[list[ExchangeRate]]:
+        windows = [(code, s, e) for code, start, end in ranges for s, e in self.__windows(start, end)]
+        semaphore = Semaphore(self.__cfg.concurrency)
+        queue: Queue = Queue(self.__cfg.concurrency * 2)
+        async with self.__http.async_client() as client:
+            tasks = [ensure_future(self.__produce(client, semaphore, queue, code, s, e)) for code, s, e in windows]
+            try:
+                seen: set[tuple[str, date]] = set()
+                pending = len(tasks)
+                while pending:
+                    item = await queue.get()
+                    if item is None:
+                        pending -= 1
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
+                    exchangeRateList: list[ExchangeRate] = []
+                    for exchangeRate in item:
+                        key = (exchangeRate.Code, exchangeRate.Date)
+                        if key not in seen:
+                            seen.add(key)
+                            exchangeRateList.append(exchangeRate)
+                    if exchangeRateList:
+                        yield exchangeRateList
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await gather(*tasks, return_exceptions=True)
+
+    def iter_ranges(self, ranges: list[tuple[str, date, date]]) -> Iterator[list[ExchangeRate]]:
+        loop = new_event_loop()
+        aiter_ranges = self.__aiter_ranges(ranges)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(aiter_ranges.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(aiter_ranges.aclose())
+            loop.close()
+
+    def iter_many(self, codes: list[str], start: date, end: date) -> Iterator[list[ExchangeRate]]:
+        return self.iter_ranges([(code, start, end) for code in codes])
+
+    def fetch_many(self, codes: list[str], start: date, end: date) -> list[ExchangeRate]:
+        exchangeRateList: list[ExchangeRate] = []
+        for batch in self.iter_many(codes, start, end):
+            exchangeRateList.extend(batch)
+        return exchangeRateList
 
     def get_GBP_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[CurrencyCode]:
         return self.__get_data(self.CurrencyCodeEnum.GBP, startDay, startMonth, startYear, endDay, endMonth, endYear)
@@ -90,5 +206,8 @@ class ExchangeRateWebAPi:
     def get_JPY_data(self, startDay: int, startMonth: int, startYear: int, endDay: int, endMonth: int, endYear: int) -> list[CurrencyCode]:
         return self.__get_data(self.CurrencyCodeEnum.JPY, startDay, startMonth, startYear, endDay, endMonth, endYear)
 
-    def __init__(self):
-        pass
\ No newline at end of file
+    def __init__(self, cfg: HTTP, cacheCfg: Cache, http: IHTTP, cache: IResponseCache):
+        self.__cfg = cfg
+        self.__cacheCfg = cacheCfg
+        self.__http = http
+        self.__cache = cache
\ No newline at end of file
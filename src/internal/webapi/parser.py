@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+from typing import Iterator
+from bs4.dammit import EncodingDetector
+from lxml.etree import HTMLPullParser, _Element
+from internal.domain.entity.currency_code import CurrencyCode
+from internal.domain.entity.exchange_rate import ExchangeRate
+
+
+class TableParser:
+    def __init__(self, tableClass: str):
+        self.__tableClass = tableClass
+        self.__parser: HTMLPullParser = None
+
+    def __create_parser(self, data: bytes) -> HTMLPullParser:
+        encoding = None if EncodingDetector.find_declared_encoding(data[:4096], is_html=True) else 'utf-8'
+        return HTMLPullParser(events=('end',), tag='tr', encoding=encoding)
+
+    def __in_table(self, row: _Element) -> bool:
+        tableBody = row.getparent()
+        if tableBody is None or tableBody.tag != 'tbody':
+            return False
+        table = tableBody.getparent()
+        return table is not None and self.__tableClass in (table.get('class') or '').split()
+
+    def __read_events(self) -> Iterator[list[str]]:
+        for _, row in self.__parser.read_events():
+            if self.__in_table(row):
+                cols = [''.join(col.itertext()) for col in row.iterfind('td')]
+                yield cols
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+
+    def feed(self, data: bytes) -> Iterator[list[str]]:
+        if self.__parser is None:
+            self.__parser = self.__create_parser(data)
+        self.__parser.feed(data)
+        return self.__read_events()
+
+    def close(self) -> Iterator[list[str]]:
+        if self.__parser is None:
+            self.__parser = self.__create_parser(b'')
+        self.__parser.close()
+        return self.__read_events()
+
+
+class ExchangeRateParser:
+    def __init__(self, code: str):
+        self.__code = code
+        self.__parser = TableParser('karramba')
+
+    def __to_dataclass(self, cols: list[str]) -> ExchangeRate:
+        d = cols[0].split('.')
+        return ExchangeRate(
+            Date=date(int(d[2]), int(d[1]), int(d[0])),
+            Count=int(cols[1]),
+            Rate=Decimal(cols[2].replace(',', '.')),
+            Change=Decimal(cols[3].replace(',', '.').replace('+', '')),
+            Code=self.__code,
+        )
+
+    def feed(self, data: bytes) -> Iterator[ExchangeRate]:
+        return (self.__to_dataclass(cols) for cols in self.__parser.feed(data))
+
+    def close(self) -> Iterator[ExchangeRate]:
+        return (self.__to_dataclass(cols) for cols in self.__parser.close())
+
+    def parse(self, content: bytes) -> list[ExchangeRate]:
+        exchangeRateList = list(self.feed(content))
+        exchangeRateList.extend(self.close())
+        return exchangeRateList
+
+
+class CurrencyCodeParser:
+    def __init__(self):
+        self.__parser = TableParser('tablesorter')
+
+    def __to_dataclass(self, cols: list[str]) -> CurrencyCode:
+        return CurrencyCode(
+            Country=cols[0],
+            Currency=cols[1],
+            Code=cols[2],
+            Number=int(cols[3]) if cols[3] else -1
+        )
+
+    def feed(self, data: bytes) -> Iterator[CurrencyCode]:
+        return (self.__to_dataclass(cols) for cols in self.__parser.feed(data) if cols[2])
+
+    def close(self) -> Iterator[CurrencyCode]:
+        return (self.__to_dataclass(cols) for cols in self.__parser.close() if cols[2])
+
+    def parse(self, content: bytes) -> list[CurrencyCode]:
+        currencyCodeList = list(self.feed(content))
+        currencyCodeList.extend(self.close())
+        return currencyCodeList
\ No newline at end of file
@@ -1,19 +1,28 @@
 import logging
 import structlog
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
+from internal.controller.api import ApiHandler
+from internal.controller.export import ExportHandler
 from internal.controller.graph import GraphHandler
 from internal.controller.reader import ReaderHandler
+from internal.controller.refresh import RefreshHandler
 from pkg.logging.logging import get_logger, handle_app_logs_to_custom_logger
 from pkg.sqlite.sqlite import SQLite
+from pkg.http.http import HTTP
+from pkg.jobs.jobs import Jobs
 from config.config import new_config
 from internal.adapter.db.sqlite.currency_code import CurrencyCodeStorage
-from internal.adapter.db.sqlite.delta_rate import DeltaRateStorage
 from internal.adapter.db.sqlite.exchange_rate import ExchangeRateStorage
 from internal.adapter.db.sqlite.parameter import parameterStorage
+from internal.adapter.db.sqlite.coverage import CoverageStorage
+from internal.adapter.db.cache.exchange_rate import ExchangeRateCache
 from internal.domain.usecase.currency_code import CurrencyCodeUsecase
 from internal.domain.usecase.exchange_rate import ExchangeRateUsecase
 from internal.webapi.currency_code import CurrencyCodeWebAPi
 from internal.webapi.exchange_rate import ExchangeRateWebAPi
+from internal.webapi.cache import ResponseCache
 
 
 try:
@@ -27,22 +36,47 @@ try:
 except Exception as e:
     logger.fatal(e)
     exit()
-sqlite.setup_database()
+try:
+    sqlite.setup_database()
+except Exception as e:
+    logger.fatal(e)
+    exit()
 sqlite.set_std_date(cfg.sqlite.std_date)
+http = HTTP(cfg.http, logger)
+cache = ResponseCache(cfg.cache, logger)
 storageCurrencyCode = CurrencyCodeStorage(sqlite, logger)
-webAPiCurrencyCode = CurrencyCodeWebAPi()
-usecaseCurrencyCode = CurrencyCodeUsecase(storageCurrencyCode, webAPiCurrencyCode)
+webAPiCurrencyCode = CurrencyCodeWebAPi(cfg.cache, http, cache)
+usecaseCurrencyCode = CurrencyCodeUsecase(storageCurrencyCode, webAPiCurrencyCode, cfg.sqlite.batch_size)
 storageExchangeRate = ExchangeRateStorage(sqlite, logger)
-storageDeltaRate = DeltaRateStorage(sqlite, logger)
+if cfg.series_cache.enabled:
+    storageExchangeRate = ExchangeRateCache(storageExchangeRate, cfg.series_cache, logger)
 storageParameter = parameterStorage(sqlite, logger)
-webAPiExchangeRate = ExchangeRateWebAPi()
-usecaseExchangeRate = ExchangeRateUsecase(storageExchangeRate, storageDeltaRate, storageParameter, webAPiExchangeRate)
-handlerReader = ReaderHandler(usecaseExchangeRate, usecaseCurrencyCode)
-handlerGraph = GraphHandler(usecaseExchangeRate)
+storageCoverage = CoverageStorage(sqlite, logger)
+webAPiExchangeRate = ExchangeRateWebAPi(cfg.http, cfg.cache, http, cache)
+usecaseExchangeRate = ExchangeRateUsecase(storageExchangeRate, storageParameter, storageCoverage, webAPiExchangeRate, cfg.sqlite.batch_size)
+jobs = Jobs(cfg.jobs, logger)
+handlerReader = ReaderHandler(usecaseExchangeRate, usecaseCurrencyCode, jobs, cfg.jobs)
+handlerGraph = GraphHandler(usecaseExchangeRate, jobs, cfg.graph, cfg.figure_cache, cfg.jobs)
+handlerApi = ApiHandler(usecaseExchangeRate, usecaseCurrencyCode)
+handlerExport = ExportHandler(usecaseExchangeRate, cfg.export)
+handlerRefresh = RefreshHandler(usecaseExchangeRate, usecaseCurrencyCode, jobs, cfg.refresh, logger)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    handlerRefresh.start()
+    yield
+    handlerRefresh.stop()
+    jobs.shutdown()
+
+
 app = FastAPI(
     title=cfg.app.name,
-    version=cfg.app.version
+    version=cfg.app.version,
+    lifespan=lifespan
 )
+handlerApi.register(app)
+handlerExport.register(app)
 handlerReader.register(app)
 handlerGraph.register(app)
 access_logger = structlog.stdlib.get_logger('api.access')
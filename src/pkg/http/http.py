@@ -0,0 +1,92 @@
+from contextlib import asynccontextmanager, contextmanager
+from logging import Logger
+from time import perf_counter_ns
+from typing import AsyncIterator, Iterator
+from httpx import AsyncClient, Client, HTTPStatusError, Limits, Response, Timeout, TransportError
+from tenacity import AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from config.config import HTTP as Cfg
+
+
+class HTTP:
+    def __init__(self, cfg: Cfg, logger: Logger):
+        self.__cfg = cfg
+        self.__logger = logger
+        self.__client = Client(timeout=self.__timeout(), limits=self.__limits(), follow_redirects=True)
+
+    def __timeout(self) -> Timeout:
+        return Timeout(self.__cfg.read_timeout, connect=self.__cfg.connect_timeout, pool=None)
+
+    def __limits(self) -> Limits:
+        return Limits(max_connections=self.__cfg.concurrency, max_keepalive_connections=self.__cfg.concurrency)
+
+    def __retrying_kwargs(self) -> dict:
+        return {
+            'stop': stop_after_attempt(self.__cfg.tries),
+            'wait': wait_exponential_jitter(initial=self.__cfg.backoff, max=self.__cfg.backoff_max),
+            'retry': retry_if_exception(self.__is_retryable),
+            'reraise': True,
+        }
+
+    def __is_retryable(self, e: BaseException) -> bool:
+        if isinstance(e, TransportError):
+            return True
+        if isinstance(e, HTTPStatusError):
+            return e.response.status_code == 429 or e.response.status_code >= 500
+        return False
+
+    def __log_attempt(self, url: str, attempt: int, start: int, status: str, failed: bool = False) -> None:
+        duration = (perf_counter_ns() - start) / 10 ** 6
+        message = f"HTTP GET '{url}' attempt {attempt}: {status} in {duration:.1f} ms"
+        if failed:
+            self.__logger.warning(message)
+        else:
+            self.__logger.info(message)
+
+    def __check(self, response: Response) -> None:
+        if response.is_error:
+            response.raise_for_status()
+
+    @contextmanager
+    def stream(self, url: str, headers: dict[str, str] = None) -> Iterator[Response]:
+        for attempt in Retrying(**self.__retrying_kwargs()):
+            with attempt:
+                start = perf_counter_ns()
+                try:
+                    response = self.__client.send(self.__client.build_request('GET', url, headers=headers), stream=True)
+                    try:
+                        self.__check(response)
+                    except Exception:
+                        response.close()
+                        raise
+                except Exception as e:
+                    self.__log_attempt(url, attempt.retry_state.attempt_number, start, type(e).__name__, True)
+                    raise
+                self.__log_attempt(url, attempt.retry_state.attempt_number, start, str(response.status_code))
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def async_client(self) -> AsyncClient:
+        return AsyncClient(timeout=self.__timeout(), limits=self.__limits(), follow_redirects=True)
+
+    @asynccontextmanager
+    async def stream_async(self, client: AsyncClient, url: str, headers: dict[str, str] = None) -> AsyncIterator[Response]:
+        async for attempt in AsyncRetrying(**self.__retrying_kwargs()):
+            with attempt:
+                start = perf_counter_ns()
+                try:
+                    response = await client.send(client.build_request('GET', url, headers=headers), stream=True)
+                    try:
+                        self.__check(response)
+                    except Exception:
+                        await response.aclose()
+                        raise
+                except Exception as e:
+                    self.__log_attempt(url, attempt.retry_state.attempt_number, start, type(e).__name__, True)
+                    raise
+                self.__log_attempt(url, attempt.retry_state.attempt_number, start, str(response.status_code))
+        try:
+            yield response
+        finally:
+            await response.aclose()
\ No newline at end of file
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from logging import Logger
+from threading import Lock
+from typing import Callable, Hashable
+from uuid import uuid4
+from config.config import Jobs as Cfg
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str = None
+    key: Hashable = None
+    status: str = 'pending'
+    progress: int = 0
+    error: str = None
+
+
+class Jobs:
+    def __init__(self, cfg: Cfg, logger: Logger):
+        self.__cfg = cfg
+        self.__logger = logger
+        self.__executor = ThreadPoolExecutor(max_workers=cfg.concurrency, thread_name_prefix='job')
+        self.__jobs: OrderedDict[str, Job] = OrderedDict()
+        self.__active: dict[Hashable, str] = {}
+        self.__lock = Lock()
+
+    def __update(self, id: str, **changes) -> None:
+        with self.__lock:
+            self.__jobs[id] = replace(self.__jobs[id], **changes)
+
+    def __finish(self, id: str, **changes) -> None:
+        with self.__lock:
+            job = replace(self.__jobs[id], **changes)
+            self.__jobs[id] = job
+            self.__active.pop(job.key, None)
+            finished = [job.id for job in self.__jobs.values() if job.status in ('done', 'failed')]
+            for finished_id in finished[:max(0, len(finished) - self.__cfg.history)]:
+                del self.__jobs[finished_id]
+
+    def __run(self, id: str, fn: Callable[[Callable[[int], None]], None]) -> None:
+        self.__update(id, status='running')
+        self.__logger.info(f"Job '{id}' started")
+        try:
+            fn(lambda progress: self.__update(id, progress=progress))
+        except Exception as e:
+            self.__logger.error(f"Job '{id}' failed: {e}")
+            self.__finish(id, status='failed', error=str(e))
+            return
+        self.__logger.info(f"Job '{id}' done")
+        self.__finish(id, status='done')
+
+    def submit(self, key: Hashable, fn: Callable[[Callable[[int], None]], None]) -> str:
+        with self.__lock:
+            if key in self.__active:
+                return self.__active[key]
+            id = uuid4().hex
+            self.__jobs[id] = Job(id=id, key=key)
+            self.__active[key] = id
+        self.__executor.submit(self.__run, id, fn)
+        return id
+
+    def get(self, id: str) -> Job:
+        with self.__lock:
+            return self.__jobs.get(id)
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+
+@dataclass(frozen=True)
+class Stats:
+    hits: int = 0
+    misses: int = 0
+    items: int = 0
+    weight: int = 0
+
+
+class LRU:
+    def __init__(self, size: int, weigh: Callable[[Any], int] = None):
+        self.__size = size
+        self.__weigh = weigh or (lambda _: 1)
+        self.__data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.__weight = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = Lock()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self.__lock:
+            if key not in self.__data:
+                self.__misses += 1
+                return False, None
+            self.__hits += 1
+            self.__data.move_to_end(key)
+            return True, self.__data[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        weight = self.__weigh(value)
+        with self.__lock:
+            if key in self.__data:
+                self.__weight -= self.__data.pop(key)[1]
+            if weight > self.__size:
+                return
+            self.__data[key] = (value, weight)
+            self.__weight += weight
+            while self.__weight > self.__size:
+                self.__weight -= self.__data.popitem(last=False)[1][1]
+
+    def pop(self, key: Hashable) -> None:
+        with self.__lock:
+            if key in self.__data:
+                self.__weight -= self.__data.pop(key)[1]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+            self.__weight = 0
+
+    def stats(self) -> Stats:
+        with self.__lock:
+            return Stats(
+                hits=self.__hits,
+                misses=self.__misses,
+                items=len(self.__data),
+                weight=self.__weight
+            )
\ No newline at end of file
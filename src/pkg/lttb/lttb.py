@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts = edges[:-1]
+    ends = edges[1:]
+    nextStarts = np.append(starts[1:], n - 1)
+    nextEnds = np.append(ends[1:], n)
+    sumX = np.concatenate(([0.0], np.cumsum(x)))
+    sumY = np.concatenate(([0.0], np.cumsum(y)))
+    avgX = ((sumX[nextEnds] - sumX[nextStarts]) / (nextEnds - nextStarts))[:, None]
+    avgY = ((sumY[nextEnds] - sumY[nextStarts]) / (nextEnds - nextStarts))[:, None]
+    candidates = np.minimum(starts[:, None] + np.arange((ends - starts).max()), (ends - 1)[:, None])
+    cx = x[candidates]
+    cy = y[candidates]
+    p = cy - avgY
+    q = avgX - cx
+    r = cx * avgY - avgX * cy
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        a = candidates[i, np.abs(x[a] * p[i] + y[a] * q[i] + r[i]).argmax()]
+        indices[i + 1] = a
+    return indices
\ No newline at end of file
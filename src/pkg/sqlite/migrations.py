@@ -0,0 +1,166 @@
+MIGRATIONS: list[list[str]] = [
+    [
+        """
+            CREATE TABLE IF NOT EXISTS currency_codes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                country TEXT,
+                currency TEXT,
+                code TEXT,
+                number INTEGER
+            );
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS exchange_rates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT,
+                count INTEGER,
+                rate TEXT,
+                change TEXT,
+                code TEXT
+            );
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS delta_rates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT,
+                delta TEXT,
+                code TEXT
+            );
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS parameters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                value TEXT
+            );
+        """,
+    ],
+    [
+        """
+            DELETE FROM currency_codes
+            WHERE id NOT IN (
+                SELECT MAX(id)
+                FROM currency_codes
+                GROUP BY code
+            );
+        """,
+        """
+            CREATE UNIQUE INDEX IF NOT EXISTS currency_codes_code
+            ON currency_codes (code);
+        """,
+        """
+            DELETE FROM exchange_rates
+            WHERE id NOT IN (
+                SELECT MAX(id)
+                FROM exchange_rates
+                GROUP BY code, date
+            );
+        """,
+        """
+            CREATE UNIQUE INDEX IF NOT EXISTS exchange_rates_code_date
+            ON exchange_rates (code, date);
+        """,
+        """
+            DELETE FROM delta_rates
+            WHERE id NOT IN (
+                SELECT MAX(id)
+                FROM delta_rates
+                GROUP BY code, date
+            );
+        """,
+        """
+            CREATE UNIQUE INDEX IF NOT EXISTS delta_rates_code_date
+            ON delta_rates (code, date);
+        """,
+        """
+            DELETE FROM parameters
+            WHERE id NOT IN (
+                SELECT MIN(id)
+                FROM parameters
+                GROUP BY name
+            );
+        """,
+        """
+            CREATE UNIQUE INDEX IF NOT EXISTS parameters_name
+            ON parameters (name);
+        """,
+        """
+            ANALYZE;
+        """,
+    ],
+    [
+        """
+            CREATE TABLE IF NOT EXISTS coverages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code TEXT,
+                start TEXT,
+                end TEXT
+            );
+        """,
+        """
+            CREATE INDEX IF NOT EXISTS coverages_code_start
+            ON coverages (code, start);
+        """,
+    ],
+    [
+        """
+            ALTER TABLE exchange_rates
+            ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;
+        """,
+        """
+            CREATE INDEX IF NOT EXISTS exchange_rates_code_revision
+            ON exchange_rates (code, revision);
+        """,
+    ],
+    [
+        """
+            DROP TABLE IF EXISTS delta_rates;
+        """,
+        """
+            DELETE FROM parameters
+            WHERE name LIKE 'delta_revision_%';
+        """,
+    ],
+    [
+        """
+            CREATE TABLE exchange_rates_fixed (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date INTEGER,
+                count INTEGER,
+                rate INTEGER,
+                change INTEGER,
+                code TEXT,
+                revision INTEGER NOT NULL DEFAULT 0
+            );
+        """,
+        """
+            INSERT INTO exchange_rates_fixed (id, date, count, rate, change, code, revision)
+            SELECT id, CAST(julianday(date) - 1721424.5 AS INTEGER), count, CAST(round(CAST(rate AS REAL) * 1000000) AS INTEGER), CAST(round(CAST(change AS REAL) * 1000000) AS INTEGER), code, revision
+            FROM exchange_rates;
+        """,
+        """
+            DROP TABLE exchange_rates;
+        """,
+        """
+            ALTER TABLE exchange_rates_fixed
+            RENAME TO exchange_rates;
+        """,
+        """
+            CREATE UNIQUE INDEX IF NOT EXISTS exchange_rates_code_date
+            ON exchange_rates (code, date);
+        """,
+        """
+            CREATE INDEX IF NOT EXISTS exchange_rates_code_revision
+            ON exchange_rates (code, revision);
+        """,
+        """
+            ANALYZE;
+        """,
+    ],
+    [
+        """
+            CREATE INDEX IF NOT EXISTS exchange_rates_revision
+            ON exchange_rates (revision);
+        """,
+    ],
+]
\ No newline at end of file
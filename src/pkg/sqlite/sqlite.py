@@ -1,15 +1,23 @@
-from sqlite3 import connect
-from typing import Any
+from sqlite3 import connect, Connection, Cursor
+from threading import local
+from typing import Any, Callable, Iterator
+from contextlib import contextmanager
 from config.config import SQLite as Cfg
+from pkg.sqlite.migrations import MIGRATIONS
 from datetime import date
 
 
 class SQLite:
     def __init__(self, cfg: Cfg):
+        self.__cfg = cfg
+        self.__local = local()
+        self.__get_connection()
+
+    def __connect(self, check_same_thread: bool = True) -> Connection:
         exception = None
-        for _ in range(cfg.tries):
+        for _ in range(self.__cfg.tries):
             try:
-                self.__connection = connect(cfg.path, cfg.timeout, check_same_thread=False)
+                connection = connect(self.__cfg.path, self.__cfg.timeout, check_same_thread=check_same_thread)
             except Exception as e:
                 exception = e
                 continue
@@ -17,76 +25,119 @@ class SQLite:
             break
         if exception is not None:
             raise Exception('ошибка подключения к базе данных')
-    
+        connection.execute('PRAGMA journal_mode = WAL;')
+        connection.execute(f'PRAGMA synchronous = {self.__cfg.synchronous};')
+        connection.execute(f'PRAGMA cache_size = {int(self.__cfg.cache_size)};')
+        connection.execute(f'PRAGMA busy_timeout = {int(self.__cfg.busy_timeout)};')
+        return connection
+
+    def __get_connection(self) -> Connection:
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = self.__connect()
+            self.__local.connection = connection
+        return connection
+
+    def __commit(self, connection: Connection) -> None:
+        if not getattr(self.__local, 'depth', 0):
+            connection.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        connection = self.__get_connection()
+        depth = getattr(self.__local, 'depth', 0)
+        if not depth:
+            connection.execute('BEGIN IMMEDIATE;')
+        self.__local.depth = depth + 1
+        try:
+            yield
+        except Exception:
+            self.__local.depth = depth
+            if not depth:
+                connection.rollback()
+            raise
+        self.__local.depth = depth
+        if not depth:
+            connection.commit()
+
     def exec(self, sql: str, args: set[Any]=()) -> None:
-        cursor = self.__connection.cursor()
+        connection = self.__get_connection()
+        cursor = connection.cursor()
         cursor.execute(sql, args)
         cursor.close()
-        self.__connection.commit()
+        self.__commit(connection)
+
+    def exec_many(self, sql: str, args_list: list[set[Any]]) -> None:
+        connection = self.__get_connection()
+        cursor = connection.cursor()
+        cursor.executemany(sql, args_list)
+        cursor.close()
+        self.__commit(connection)
 
-    def query(self, sql: str, args: set[Any]=()) -> list[Any]:
-        cursor = self.__connection.cursor()
+    def query(self, sql: str, args: set[Any]=(), row_factory: Callable[[Cursor, tuple], Any]=None) -> list[Any]:
+        connection = self.__get_connection()
+        cursor = connection.cursor()
+        cursor.row_factory = row_factory
         cursor.execute(sql, args)
         result = cursor.fetchall()
         cursor.close()
+        self.__commit(connection)
         return result
-        
-    def query_row(self, sql: str, args: set[Any]=()) -> Any:
-        cursor = self.__connection.cursor()
+
+    def query_iter(self, sql: str, args: set[Any]=(), size: int = 1000, row_factory: Callable[[Cursor, tuple], Any]=None) -> Iterator[list[Any]]:
+        connection = self.__connect(False)
+        try:
+            cursor = connection.cursor()
+            cursor.row_factory = row_factory
+            cursor.execute(sql, args)
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield rows
+            cursor.close()
+        finally:
+            connection.close()
+
+    def query_many(self, sql: str, args_list: list[set[Any]]) -> list[Any]:
+        connection = self.__get_connection()
+        cursor = connection.cursor()
+        result = []
+        for args in args_list:
+            cursor.execute(sql, args)
+            result.extend(cursor.fetchall())
+        cursor.close()
+        self.__commit(connection)
+        return result
+
+    def query_row(self, sql: str, args: set[Any]=(), row_factory: Callable[[Cursor, tuple], Any]=None) -> Any:
+        connection = self.__get_connection()
+        cursor = connection.cursor()
+        cursor.row_factory = row_factory
         cursor.execute(sql, args)
         result = cursor.fetchone()
+        cursor.close()
+        self.__commit(connection)
         return result
 
     def setup_database(self):
-        self.exec("""
-            CREATE TABLE IF NOT EXISTS currency_codes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                country TEXT,
-                currency TEXT,
-                code TEXT,
-                number INTEGER
-            );
-        """)
-        self.exec("""
-            CREATE TABLE IF NOT EXISTS exchange_rates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT,
-                count INTEGER,
-                rate TEXT,
-                change TEXT,
-                code TEXT
-            );
-        """)
-        self.exec("""
-            CREATE TABLE IF NOT EXISTS delta_rates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT,
-                delta TEXT,
-                code TEXT
-            );
-        """)
-        self.exec("""
-            CREATE TABLE IF NOT EXISTS parameters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                value TEXT
-            );
-        """)
+        version = int(self.query_row('PRAGMA user_version;')[0])
+        for i, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            try:
+                with self.transaction():
+                    for sql in migration:
+                        self.exec(sql)
+                    self.exec(f'PRAGMA user_version = {i};')
+            except Exception:
+                raise Exception(f'ошибка миграции базы данных до версии {i}')
 
     def set_std_date(self, std_date: str):
         d = std_date.split('.')
         std_date = date(int(d[2]), int(d[1]), int(d[0]))
         q = """
-            SELECT EXISTS (
-			    SELECT id
-			    FROM parameters
-			    WHERE name = 'std_date'
-		    );
+            INSERT INTO parameters (name, value)
+            VALUES ('std_date', ?)
+            ON CONFLICT (name) DO UPDATE
+            SET value = excluded.value;
         """
-        exists = bool(self.query_row(q)[0])
-        if (not exists):
-            q = f"""
-                INSERT INTO parameters (name, value)
-                VALUES ('std_date', '{str(std_date)}');
-            """
-            self.exec(q)
\ No newline at end of file
+        self.exec(q, (str(std_date),))
\ No newline at end of file